@@ -77,14 +77,14 @@ class VMDetailsActions(VMNetworkActions):
         network_interfaces = []
 
         if deploy_app.wait_for_ip and vm.power_state is PowerState.ON:
-            primary_ip = self.get_vm_ip(vm._entity, ip_regex=deploy_app.ip_regex)
+            primary_ip = self.get_vm_ip(vm, ip_regex=deploy_app.ip_regex)
         else:
             primary_ip = None
 
         for vnic in vm.vnics:
             network = vm.get_network_from_vnic(vnic)
             is_predefined = network.name in self._resource_conf.reserved_networks
-            private_ip = self.get_vm_ip_from_vnic(vm._entity, vnic._device)
+            private_ip = self.get_vm_ip_from_vnic(vm, vnic)
             vlan_id = vm.get_network_vlan_id(network)
 
             if vlan_id and (self.is_quali_network(network.name) or is_predefined):
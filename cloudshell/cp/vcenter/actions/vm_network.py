@@ -2,12 +2,10 @@ from __future__ import annotations
 
 import ipaddress
 import re
-import time
+from contextlib import closing
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING
 
-from pyVmomi import vim
-
 from cloudshell.cp.vcenter.exceptions import VMIPNotFoundException
 
 if TYPE_CHECKING:
@@ -15,6 +13,12 @@ if TYPE_CHECKING:
 
     from cloudshell.cp.core.cancellation_manager import CancellationContextManager
 
+    from cloudshell.cp.vcenter.handlers.network_handler import (
+        DVPortGroupHandler,
+        NetworkHandler,
+    )
+    from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
+    from cloudshell.cp.vcenter.handlers.vnic_handler import VnicHandler
     from cloudshell.cp.vcenter.resource_config import VCenterResourceConfig
 
 
@@ -22,6 +26,7 @@ class VMNetworkActions:
     QUALI_NETWORK_PREFIX = "QS_"
     DEFAULT_IP_REGEX = ".*"
     DEFAULT_IP_WAIT_TIME = 5
+    GUEST_IP_PROPERTIES = ("guest.ipAddress", "guest.net")
 
     def __init__(
         self,
@@ -47,10 +52,10 @@ class VMNetworkActions:
         self._logger.info(f"IP address is IPv4: {is_ipv4}")
         return is_ipv4
 
-    def get_vm_ip_from_vnic(self, vm, vnic):
+    def get_vm_ip_from_vnic(self, vm: VmHandler, vnic: VnicHandler) -> str | None:
         """Get VM IP address from the vNIC."""
-        self._logger.info(f"Getting IPv4 address from the vNIC {vnic}")
-        for net in vm.guest.net:
+        self._logger.info(f"Getting IPv4 address from the vNIC {vnic.label}")
+        for net in vm.guest_net:
             if str(net.deviceConfigId) == str(vnic.key):
                 for ip_address in net.ipAddress:
                     if self._is_ipv4_address(ip_address):
@@ -67,15 +72,19 @@ class VMNetworkActions:
         except Exception:
             raise AttributeError(f"Invalid IP regex : {ip_regex}")
 
-    def _get_vm_ip_addresses(self, vm, default_network):
+    def _get_vm_ip_addresses(
+        self,
+        vm: VmHandler,
+        default_network: NetworkHandler | DVPortGroupHandler | None,
+    ) -> list[str]:
         """Get all VM IP address except the default network address."""
-        self._logger.info(f"Getting all VM IP addresses for the vm {vm.name}")
+        self._logger.info(f"Getting all VM IP addresses for the {vm}")
         ips = []
 
-        if vm.guest.ipAddress:
-            ips.append(vm.guest.ipAddress)
+        if vm.guest_ip_address:
+            ips.append(vm.guest_ip_address)
 
-        for nic in vm.guest.net:
+        for nic in vm.guest_net:
             if not default_network or nic.network != default_network.name:
                 for addr in nic.ipAddress:
                     if addr:
@@ -86,7 +95,7 @@ class VMNetworkActions:
 
     def _find_vm_ip(self, vm, default_network, ip_match_function):
         """Find VM IP address."""
-        self._logger.info(f"Finding VM IP address for the vm {vm.name}")
+        self._logger.info(f"Finding VM IP address for the {vm}")
         for ip in self._get_vm_ip_addresses(vm, default_network):
             if self._is_ipv4_address(ip):
                 if ip_match_function(ip):
@@ -94,33 +103,37 @@ class VMNetworkActions:
 
     def get_vm_ip(
         self,
-        vm: vim.VirtualMachine,  # todo VmHandler
-        default_network: vim.Network | None = None,
+        vm: VmHandler,
+        default_network: NetworkHandler | DVPortGroupHandler | None = None,
         ip_regex: str | None = None,
         timeout: int | None = None,
     ) -> str:
         """Get VM IP address."""
-        self._logger.info(f"Getting IP address for the VM {vm.name} from the vCenter")
+        self._logger.info(f"Getting IP address for the {vm} from the vCenter")
 
         timeout = timeout or 0
         timeout_time = datetime.now() + timedelta(seconds=timeout)
         ip_regex_match = self._get_ip_regex_match_function(ip_regex)
-        ip = None
-
-        while not ip:
-            with self._cancellation_manager:
-                self._logger.info(f"Getting IP for VM {vm.name}")
-                ip = self._find_vm_ip(
-                    vm=vm,
-                    default_network=default_network,
-                    ip_match_function=ip_regex_match,
-                )
 
-            if ip:
-                return ip
-
-            with self._cancellation_manager:
-                time.sleep(self.DEFAULT_IP_WAIT_TIME)
+        # addresses are checked only when VMware Tools publish new ones
+        updates = vm.iter_properties_updates(
+            self.GUEST_IP_PROPERTIES, self.DEFAULT_IP_WAIT_TIME
+        )
+        ip = None
+        with closing(updates):
+            for updates_count, changed in enumerate(updates):
+                with self._cancellation_manager:
+                    if changed:
+                        self._logger.info(f"Getting IP for the {vm}")
+                        ip = self._find_vm_ip(
+                            vm=vm,
+                            default_network=default_network,
+                            ip_match_function=ip_regex_match,
+                        )
+
+                if ip:
+                    return ip
 
-            if datetime.now() > timeout_time:
-                raise VMIPNotFoundException("Unable to get VM IP")
+                # the first update contains current values, wait for one more
+                if updates_count and datetime.now() > timeout_time:
+                    raise VMIPNotFoundException("Unable to get VM IP")
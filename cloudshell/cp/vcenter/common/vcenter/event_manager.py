@@ -1,14 +1,20 @@
 from __future__ import annotations
 
-import time
 from datetime import datetime, timedelta
 
 from pyVmomi import vim
 
 from cloudshell.cp.vcenter.handlers.si_handler import SiHandler
+from cloudshell.cp.vcenter.utils.event_collector import EventsReader
 
 
 class EventManager:
+    """Waits for the VM events.
+
+    Every wait creates an EventHistoryCollector and reads only new events from
+    it, a new event wakes the wait immediately.
+    """
+
     class VMOSCustomization:
         START_EVENT = "CustomizationStartedEvent"
         SUCCESS_END_EVENT = "CustomizationSucceeded"
@@ -20,13 +26,12 @@ class EventManager:
         START_EVENT_WAIT_TIME = 10
         END_EVENT_WAIT_TIME = 30
 
-    def _get_vm_events(
-        self,
-        si: SiHandler,
+    @staticmethod
+    def _get_vm_events_filter_spec(
         vm,
         event_type_id_list,
         event_start_time: datetime | None = None,
-    ):
+    ) -> vim.event.EventFilterSpec:
         time_filter = vim.event.EventFilterSpec.ByTime()
         time_filter.beginTime = event_start_time
 
@@ -34,12 +39,10 @@ class EventManager:
         vm_events = vim.event.EventFilterSpec.ByEntity(entity=vm, recursion="self")
 
         # noinspection PyArgumentList
-        filter_spec = vim.event.EventFilterSpec(
+        return vim.event.EventFilterSpec(
             entity=vm_events, eventTypeId=event_type_id_list, time=time_filter
         )
 
-        return si.query_event(filter_spec)
-
     def _wait_for_event(
         self,
         si: SiHandler,
@@ -51,27 +54,30 @@ class EventManager:
         event_start_time: datetime | None = None,
     ):
         timeout_time = datetime.now() + timedelta(seconds=timeout)
+        filter_spec = self._get_vm_events_filter_spec(
+            vm, event_type_id_list, event_start_time
+        )
 
-        while True:
-            logger.info(f"Getting VM '{vm.name}' events {event_type_id_list}")
-            events = self._get_vm_events(
-                si,
-                vm,
-                event_type_id_list=event_type_id_list,
-                event_start_time=event_start_time,
-            )
-
-            if events:
-                logger.info(f"Found VM '{vm.name}' events: {events}")
-                return next(iter(events))
-
-            time.sleep(wait_time)
-
-            if datetime.now() > timeout_time:
-                logger.info(
-                    f"Timeout for VM '{vm.name}' events {event_type_id_list} reached"
-                )
-                return
+        with si.create_event_collector(
+            filter_spec
+        ) as collector, si.create_property_collector() as property_collector:
+            events_reader = EventsReader(collector, property_collector)
+            while True:
+                logger.info(f"Getting VM '{vm.name}' events {event_type_id_list}")
+                events = events_reader.read()
+
+                if events:
+                    logger.info(f"Found VM '{vm.name}' events: {events}")
+                    return next(iter(events))
+
+                events_reader.wait(wait_time)
+
+                if datetime.now() > timeout_time:
+                    logger.info(
+                        f"Timeout for VM '{vm.name}' events {event_type_id_list} "
+                        f"reached"
+                    )
+                    return
 
     def wait_for_vm_os_customization_start_event(
         self,
@@ -1,10 +1,10 @@
 from .autoload import VCenterAutoloadFlow
 from .cluster_usage import get_cluster_usage
-from .delete_instance import delete_instance
+from .delete_instance import delete_instance, delete_instances
 from .deploy_vm import get_deploy_flow
 from .get_attribute_hints.command import get_hints
 from .get_vm_web_console import get_vm_web_console
-from .power_flow import VCenterPowerFlow
+from .power_flow import VCenterBatchPowerFlow, VCenterPowerFlow
 from .reconfigure_vm import reconfigure_vm
 from .refresh_ip import refresh_ip
 from .snapshots import SnapshotFlow
@@ -15,8 +15,10 @@ __all__ = (
     refresh_ip,
     VCenterAutoloadFlow,
     VCenterPowerFlow,
+    VCenterBatchPowerFlow,
     get_deploy_flow,
     delete_instance,
+    delete_instances,
     get_vm_uuid_by_name,
     get_cluster_usage,
     reconfigure_vm,
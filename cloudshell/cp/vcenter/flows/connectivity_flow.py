@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-import time
-from contextlib import suppress
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from concurrent import futures as ft
 from logging import Logger
-from threading import Lock
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict
 
 from cloudshell.shell.flows.connectivity.basic_flow import AbstractConnectivityFlow
+from cloudshell.shell.flows.connectivity.helpers.remove_vlans import (
+    prepare_remove_vlan_actions,
+)
 from cloudshell.shell.flows.connectivity.models.connectivity_model import (
     ConnectionModeEnum,
     ConnectivityActionModel,
@@ -24,16 +27,14 @@ from cloudshell.cp.vcenter.handlers.network_handler import (
     AbstractPortGroupHandler,
     DVPortGroupHandler,
     HostPortGroupHandler,
-    HostPortGroupNotFound,
     NetworkHandler,
-    NetworkNotFound,
     PortGroupNotFound,
 )
 from cloudshell.cp.vcenter.handlers.si_handler import SiHandler
 from cloudshell.cp.vcenter.handlers.switch_handler import (
     DvSwitchHandler,
     DvSwitchNotFound,
-    VSwitchHandler,
+    PortGroupCreationResult,
 )
 from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
 from cloudshell.cp.vcenter.handlers.vsphere_sdk_handler import VSphereSDKHandler
@@ -43,10 +44,14 @@ from cloudshell.cp.vcenter.utils.connectivity_helpers import (
     get_available_vnic,
     is_network_generated_name,
 )
+from cloudshell.cp.vcenter.utils.keyed_lock import KeyedLock
+from cloudshell.cp.vcenter.utils.task_waiter import VcenterTaskWaiter
 
 if TYPE_CHECKING:
     from cloudshell.cp.core.reservation_info import ReservationInfo
 
+VM_ACTIONS = Dict[ft.Future, ConnectivityActionModel]
+
 
 class DvSwitchNameEmpty(BaseVCenterException):
     def __init__(self):
@@ -71,152 +76,368 @@ class VCenterConnectivityFlow(AbstractConnectivityFlow):
             reservation_info=self._reservation_info,
             logger=self._logger,
         )
-        self._network_lock = Lock()
+        # port groups are created once by name, actions of the VM
+        # are always processed by one thread
+        self._port_group_lock = KeyedLock()
+        self._dc: DcHandler | None = None
+        self._holding_network: NetworkHandler | DVPortGroupHandler | None = None
+        self._dv_switch: DvSwitchHandler | None = None
+        self._port_groups: dict[str, PortGroupCreationResult] = {}
+        # networks that were disconnected from VMs or weren't connected
+        # because of errors, name -> (network, VM)
+        self._released_networks: dict[
+            str, tuple[NetworkHandler | DVPortGroupHandler | None, VmHandler]
+        ] = {}
 
     def apply_connectivity(self, request: str) -> str:
         self._validate_dvs_present()
-        return super().apply_connectivity(request)
+        self._logger.debug(f"Apply connectivity request: {request}")
+        actions = self._parse_connectivity_request_service.get_actions(request)
+        self._validate_received_actions(actions)
+        set_actions = [a for a in actions if a.type is a.type.SET_VLAN]
+        remove_actions = [a for a in actions if a.type is a.type.REMOVE_VLAN]
+        remove_actions = prepare_remove_vlan_actions(set_actions, remove_actions)
+        try:
+            self._resolve_vcenter_entities()
+        except Exception as e:
+            self._fail_actions(remove_actions, e)
+            self._fail_actions(set_actions, e)
+            return self._get_result()
+
+        with ft.ThreadPoolExecutor() as executor:
+            futures = self._submit_by_vm(
+                executor, self._remove_vm_vlans, remove_actions
+            )
+            self._wait_futures(futures)
+
+            self._filter_set_actions(set_actions)
+            self._create_port_groups(set_actions)
+            futures = self._submit_by_vm(executor, self._set_vm_vlans, set_actions)
+            self._wait_futures(futures)
+
+        self._reclaim_port_groups()
+        return self._get_result()
 
     def _validate_dvs_present(self):
         if not self._resource_conf.default_dv_switch:
             raise DvSwitchNameEmpty
 
-    def _set_vlan(self, action: ConnectivityActionModel) -> ConnectivityActionResult:
-        vlan_id = action.connection_params.vlan_id
+    def _fail_actions(
+        self, actions: Iterable[ConnectivityActionModel], error: Exception
+    ) -> None:
+        """Report the error that prevents processing of the actions."""
+        futures = {}
+        for action in actions:
+            future = ft.Future()
+            future.set_exception(error)
+            futures[future] = action
+        self._wait_futures(futures)
+
+    def _resolve_vcenter_entities(self) -> None:
+        """Get entities that are shared by all actions of the request once."""
         vc_conf = self._resource_conf
-        dc = DcHandler.get_dc(vc_conf.default_datacenter, self._si)
-        vm = dc.get_vm_by_uuid(action.custom_action_attrs.vm_uuid)
-        self._logger.info(f"Start setting vlan {vlan_id} for the {vm}")
-
-        dc.get_network(vc_conf.holding_network)  # validate that it exists
-        port_group_name = generate_port_group_name(
-            vc_conf.default_dv_switch,
-            vlan_id,
-            action.connection_params.mode.value,
-        )
+        self._dc = DcHandler.get_dc(vc_conf.default_datacenter, self._si)
+        self._holding_network = self._dc.get_network(vc_conf.holding_network)
+        try:
+            self._dv_switch = self._dc.get_dv_switch(vc_conf.default_dv_switch)
+        except DvSwitchNotFound:
+            # it's a name of the vSwitch, it's different for every host
+            self._dv_switch = None
 
-        port_group = self._get_or_create_port_group(
-            dc, vm, port_group_name, vlan_id, action.connection_params.mode
-        )
+    def _create_port_groups(self, set_actions: list[ConnectivityActionModel]) -> None:
+        """Create all missing port groups of the request with one task."""
+        if not self._dv_switch or not set_actions:
+            return
+
+        vc_conf = self._resource_conf
+        port_groups = {}
+        for action in set_actions:
+            vlan_id = action.connection_params.vlan_id
+            port_mode = action.connection_params.mode
+            name = generate_port_group_name(
+                vc_conf.default_dv_switch, vlan_id, port_mode.value
+            )
+            port_groups[name] = name, vlan_id, port_mode
+
+        try:
+            results = self._dv_switch.create_port_groups(
+                port_groups.values(), vc_conf.promiscuous_mode, self._logger
+            )
+        except Exception as e:
+            # every action will try to create its port group by itself
+            self._logger.warning(f"Failed to create port groups in bulk: {e}")
+            return
+
+        created = [result for result in results.values() if result.created]
+        if created and self._vsphere_client is not None:
+            try:
+                self._vsphere_client.assign_tags_to_objects(
+                    [result.port_group for result in created]
+                )
+            except Exception as e:
+                for result in created:
+                    results[result.name] = PortGroupCreationResult(result.name, error=e)
+        self._port_groups.update(results)
+
+    def _submit_by_vm(
+        self,
+        executor: ft.Executor,
+        func: Callable[[VmHandler, VM_ACTIONS], None],
+        actions: Iterable[ConnectivityActionModel],
+    ) -> VM_ACTIONS:
+        """Run actions of every VM together in a separate thread.
+
+        Every action gets its own future, so results are reported per action.
+        """
+        vms_actions = defaultdict(dict)
+        for action in actions:
+            vm_uuid = action.custom_action_attrs.vm_uuid
+            vms_actions[vm_uuid][ft.Future()] = action
+
+        futures = {}
+        for vm_uuid, vm_actions in vms_actions.items():
+            executor.submit(self._run_vm_actions, func, vm_uuid, vm_actions)
+            futures.update(vm_actions)
+        return futures
+
+    def _run_vm_actions(
+        self,
+        func: Callable[[VmHandler, VM_ACTIONS], None],
+        vm_uuid: str,
+        actions: VM_ACTIONS,
+    ) -> None:
         try:
-            with self._network_lock:
+            vm = self._dc.get_vm_by_uuid(vm_uuid)
+            func(vm, actions)
+        except Exception as e:
+            for future in actions:
+                if not future.done():
+                    future.set_exception(e)
+
+    def _run_action(
+        self,
+        func: Callable[[VmHandler, VM_ACTIONS], None],
+        action: ConnectivityActionModel,
+    ) -> ConnectivityActionResult:
+        future = ft.Future()
+        self._run_vm_actions(func, action.custom_action_attrs.vm_uuid, {future: action})
+        return future.result()
+
+    def _set_vlan(self, action: ConnectivityActionModel) -> ConnectivityActionResult:
+        return self._run_action(self._set_vm_vlans, action)
+
+    def _remove_vlan(self, action: ConnectivityActionModel) -> ConnectivityActionResult:
+        return self._run_action(self._remove_vm_vlans, action)
+
+    def _set_vm_vlans(self, vm: VmHandler, actions: VM_ACTIONS) -> None:
+        """Connect vNICs of the VM to port groups with one reconfigure task."""
+        vc_conf = self._resource_conf
+        changes = vm.network_changes()
+        queued = {}
+        for future, action in actions.items():
+            vlan_id = action.connection_params.vlan_id
+            self._logger.info(f"Start setting vlan {vlan_id} for the {vm}")
+            port_group_name = generate_port_group_name(
+                vc_conf.default_dv_switch,
+                vlan_id,
+                action.connection_params.mode.value,
+            )
+            try:
+                port_group = self._get_or_create_port_group(
+                    vm, port_group_name, vlan_id, action.connection_params.mode
+                )
+            except Exception as e:
+                future.set_exception(e)
+                continue
+
+            try:
                 vnic = get_available_vnic(
                     vm,
                     vc_conf.holding_network,
                     vc_conf.reserved_networks,
                     action.custom_action_attrs.vnic,
+                    changes,
                 )
                 if isinstance(port_group, DVPortGroupHandler):
-                    vm.connect_vnic_to_port_group(vnic, port_group, self._logger)
+                    changes.connect_vnic_to_port_group(vnic, port_group)
                 elif isinstance(port_group, HostPortGroupHandler):
-                    network = dc.get_network(port_group.name)
-                    vm.connect_vnic_to_network(vnic, network, self._logger)
-        except Exception:
-            port_group.destroy()
-            raise
-        msg = f"Setting VLAN {vlan_id} successfully completed"
-        return ConnectivityActionResult.success_result_vm(action, msg, vnic.mac_address)
+                    network = self._dc.get_network(port_group.name)
+                    changes.connect_vnic_to_network(vnic, network)
+            except Exception as e:
+                self._release_port_group(port_group, vm)
+                future.set_exception(e)
+            else:
+                queued[future] = action, port_group
 
-    def _remove_vlan(self, action: ConnectivityActionModel) -> ConnectivityActionResult:
-        vlan_id = action.connection_params.vlan_id
-        self._logger.info(f"Start removing vlan {vlan_id}")
+        try:
+            vnics = changes.apply(self._logger)
+        except Exception as e:
+            for future, (_, port_group) in queued.items():
+                self._release_port_group(port_group, vm)
+                future.set_exception(e)
+            return
+
+        for (future, (action, _)), vnic in zip(queued.items(), vnics):
+            vlan_id = action.connection_params.vlan_id
+            msg = f"Setting VLAN {vlan_id} successfully completed"
+            future.set_result(
+                ConnectivityActionResult.success_result_vm(
+                    action, msg, vnic.mac_address
+                )
+            )
 
+    def _remove_vm_vlans(self, vm: VmHandler, actions: VM_ACTIONS) -> None:
+        """Move vNICs of the VM to the holding network with one reconfigure task."""
         vc_conf = self._resource_conf
-        dc = DcHandler.get_dc(vc_conf.default_datacenter, self._si)
-        vm = dc.get_vm_by_uuid(action.custom_action_attrs.vm_uuid)
-        default_network = dc.get_network(vc_conf.holding_network)
-        vnic = vm.get_vnic_by_mac(action.connector_attrs.interface, self._logger)
-        network = vm.get_network_from_vnic(vnic)
-
-        if vlan_id:
-            expected_dv_port_name = generate_port_group_name(
-                vc_conf.default_dv_switch,
-                vlan_id,
-                action.connection_params.mode.value,
+        changes = vm.network_changes()
+        queued = {}
+        for future, action in actions.items():
+            vlan_id = action.connection_params.vlan_id
+            self._logger.info(f"Start removing vlan {vlan_id} for the {vm}")
+            try:
+                vnic = vm.get_vnic_by_mac(
+                    action.connector_attrs.interface, self._logger
+                )
+                network = vm.get_network_from_vnic(vnic)
+            except Exception as e:
+                future.set_exception(e)
+                continue
+
+            if vlan_id:
+                expected_dv_port_name = generate_port_group_name(
+                    vc_conf.default_dv_switch,
+                    vlan_id,
+                    action.connection_params.mode.value,
+                )
+                remove_network = expected_dv_port_name == network.name
+            else:
+                remove_network = is_network_generated_name(network.name)
+
+            queued_keys = {queued_vnic.key for queued_vnic in changes.vnics}
+            if remove_network and vnic.key not in queued_keys:
+                changes.connect_vnic_to_network(vnic, self._holding_network)
+                queued[future] = action, vnic, network
+            else:
+                queued[future] = action, vnic, None
+
+        try:
+            changes.apply(self._logger)
+        except Exception as e:
+            for future, (_, _, network) in queued.items():
+                if network:
+                    future.set_exception(e)
+
+        for future, (action, vnic, network) in queued.items():
+            if future.done():
+                continue
+            if network:
+                # port group is destroyed at the end if no VM uses it
+                self._released_networks[network.name] = network, vm
+            vlan_id = action.connection_params.vlan_id
+            msg = f"Removing VLAN {vlan_id} successfully completed"
+            future.set_result(
+                ConnectivityActionResult.success_result_vm(
+                    action, msg, vnic.mac_address
+                )
             )
-            remove_network = expected_dv_port_name == network.name
-        else:
-            remove_network = is_network_generated_name(network.name)
-
-        if remove_network:
-            vm.connect_vnic_to_network(vnic, default_network, self._logger)
-            if self._vsphere_client:
-                self._vsphere_client.delete_tags(network)
-            with suppress(HostPortGroupNotFound):
-                port_group = self._get_port_group(network, vm)
-                port_group.destroy()
-        msg = f"Removing VLAN {vlan_id} successfully completed"
-        return ConnectivityActionResult.success_result_vm(action, msg, vnic.mac_address)
+
+    def _release_port_group(
+        self, port_group: DVPortGroupHandler | HostPortGroupHandler, vm: VmHandler
+    ) -> None:
+        """Destroy the port group at the end of the request if no VM uses it.
+
+        Port groups are shared by the queued changes of other VMs, so they
+        can't be destroyed right away.
+        """
+        network = port_group if isinstance(port_group, DVPortGroupHandler) else None
+        self._released_networks.setdefault(port_group.name, (network, vm))
+
+    def _reclaim_port_groups(self) -> None:
+        """Destroy released port groups that have no VMs connected.
+
+        Usage of port groups is read from the switch at once and unused ones
+        are destroyed together, so removing VLANs doesn't wait for it.
+        """
+        if not self._released_networks:
+            return
+        try:
+            if self._dv_switch:
+                self._reclaim_dv_port_groups()
+            else:
+                self._reclaim_host_port_groups()
+        except Exception as e:
+            self._logger.warning(f"Failed to reclaim port groups: {e}")
+
+    def _reclaim_dv_port_groups(self) -> None:
+        unused = self._dv_switch.get_unused_port_groups()
+        names = [name for name in self._released_networks if name in unused]
+        for name in names:
+            self._delete_tags(name)
+
+        tasks = [unused[name].destroy_task() for name in names]
+        task_waiter = VcenterTaskWaiter(self._logger)
+        for name, result in zip(names, task_waiter.wait_for_tasks(tasks)):
+            if not result.success:
+                self._logger.debug(f"Port group {name} isn't destroyed: {result.error}")
+        self._si.invalidate_inventory(*names)
+
+    def _reclaim_host_port_groups(self) -> None:
+        hosts = []
+        for _, vm in self._released_networks.values():
+            host = vm.host
+            if host not in hosts:
+                hosts.append(host)
+
+        for host in hosts:
+            v_switch = host.get_v_switch(self._resource_conf.default_dv_switch)
+            unused = v_switch.get_unused_port_groups()
+            for name in self._released_networks:
+                if name in unused:
+                    self._delete_tags(name)
+                    unused[name].destroy()
+
+    def _delete_tags(self, network_name: str) -> None:
+        if not self._vsphere_client:
+            return
+        network, _ = self._released_networks[network_name]
+        if network is None:
+            return
+        try:
+            self._vsphere_client.delete_tags(network)
+        except Exception as e:
+            self._logger.warning(f"Failed to delete tags of the {network}: {e}")
 
     def _get_or_create_port_group(
         self,
-        dc: DcHandler,
         vm: VmHandler,
         port_group_name: str,
         vlan_range: str,
         port_mode: ConnectionModeEnum,
     ) -> AbstractPortGroupHandler:
-        try:
-            switch = dc.get_dv_switch(self._resource_conf.default_dv_switch)
-        except DvSwitchNotFound:
-            switch = vm.get_v_switch(self._resource_conf.default_dv_switch)
+        created_port_group = self._port_groups.get(port_group_name)
+        if created_port_group:
+            return created_port_group.get()
+
+        switch = self._dv_switch or vm.get_v_switch(
+            self._resource_conf.default_dv_switch
+        )
 
-        with self._network_lock:
+        with self._port_group_lock(port_group_name):
             try:
                 port_group = switch.get_port_group(port_group_name)
             except PortGroupNotFound:
-                switch.create_port_group(
+                port_group = switch.create_port_group(
                     port_group_name,
                     vlan_range,
                     port_mode,
                     self._resource_conf.promiscuous_mode,
                     self._logger,
                 )
-                port_group = self._wait_for_the_port_group_appears(
-                    switch, port_group_name
-                )
                 if self._vsphere_client is not None:
-                    net = self._wait_for_the_network_appears(dc, port_group_name)
+                    if isinstance(port_group, DVPortGroupHandler):
+                        net = port_group
+                    else:
+                        net = self._dc.wait_for_network(port_group_name)
                     self._vsphere_client.assign_tags(obj=net)
 
         return port_group
-
-    @staticmethod
-    def _wait_for_the_port_group_appears(
-        switch: DvSwitchHandler | VSwitchHandler, port_name: str
-    ) -> AbstractPortGroupHandler:
-        delay = 2
-        timeout = 60 * 5
-        start_time = time.time()
-
-        while time.time() - start_time < timeout:
-            try:
-                pg = switch.get_port_group(port_name)
-            except PortGroupNotFound:
-                time.sleep(delay)
-            else:
-                return pg
-        raise PortGroupNotFound(switch, port_name)
-
-    @staticmethod
-    def _wait_for_the_network_appears(dc: DcHandler, name: str) -> NetworkHandler:
-        delay = 2
-        timeout = 60 * 5
-        start_time = time.time()
-
-        while time.time() - start_time < timeout:
-            try:
-                network = dc.get_network(name)
-            except NetworkNotFound:
-                time.sleep(delay)
-            else:
-                return network
-        raise NetworkNotFound(dc, name)
-
-    def _get_port_group(
-        self, network: DVPortGroupHandler | NetworkHandler, vm: VmHandler
-    ) -> DVPortGroupHandler | HostPortGroupHandler:
-        if isinstance(network, DVPortGroupHandler):
-            return network
-        switch = vm.get_v_switch(self._resource_conf.default_dv_switch)
-        return switch.get_port_group(network.name)
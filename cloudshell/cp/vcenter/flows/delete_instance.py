@@ -1,24 +1,41 @@
 from __future__ import annotations
 
-from contextlib import suppress
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from logging import Logger
 from threading import Lock
+from typing import List, Tuple
 
 from cloudshell.cp.core.reservation_info import ReservationInfo
 
+from cloudshell.cp.vcenter.exceptions import BaseVCenterException
 from cloudshell.cp.vcenter.handlers.dc_handler import DcHandler
 from cloudshell.cp.vcenter.handlers.folder_handler import (
     FolderIsNotEmpty,
     FolderNotFound,
 )
 from cloudshell.cp.vcenter.handlers.si_handler import SiHandler
-from cloudshell.cp.vcenter.handlers.vm_handler import VmNotFound
+from cloudshell.cp.vcenter.handlers.vcenter_path import VcenterPath
+from cloudshell.cp.vcenter.handlers.vm_handler import PowerState, VmHandler, VmNotFound
 from cloudshell.cp.vcenter.handlers.vsphere_sdk_handler import VSphereSDKHandler
 from cloudshell.cp.vcenter.models.deployed_app import BaseVCenterDeployedApp
 from cloudshell.cp.vcenter.resource_config import ShutdownMethod, VCenterResourceConfig
+from cloudshell.cp.vcenter.utils.task_waiter import TaskResult, VcenterTaskWaiter
 from cloudshell.cp.vcenter.utils.vm_helpers import get_vm_folder_path
 
 folder_delete_lock = Lock()
+# max number of VMs that are destroyed or cleaned up at the same time
+MAX_PARALLEL_DELETES = 10
+# VMs that didn't shut down in time are powered off
+SOFT_SHUTDOWN_TIMEOUT = 5 * 60
+VM_ERRORS = List[Tuple[VmHandler, Exception]]
+
+
+class DeleteInstancesFailed(BaseVCenterException):
+    def __init__(self, errors: VM_ERRORS):
+        self.errors = errors
+        msg = "; ".join(f"{vm}: {e}" for vm, e in errors)
+        super().__init__(f"Failed to delete VMs. {msg}")
 
 
 def _delete_tags(vsphere_client: VSphereSDKHandler | None, obj) -> None:
@@ -54,13 +71,128 @@ def delete_instance(
     path = get_vm_folder_path(
         deployed_app, resource_conf, reservation_info.reservation_id
     )
+    _delete_folder(dc, path, vsphere_client, logger)
+
+
+def delete_instances(
+    deployed_apps: Iterable[BaseVCenterDeployedApp],
+    resource_conf: VCenterResourceConfig,
+    reservation_info: ReservationInfo,
+    logger: Logger,
+):
+    """Delete all deployed apps of the reservation together.
+
+    Power off and destroy tasks of all VMs run concurrently, the VM folders
+    are removed once after all VMs are deleted. Tags of the reservation are
+    deleted only if all VMs were deleted and the folders are removed, other
+    objects of the reservation would lose their tags otherwise.
+    """
+    deployed_apps = list(deployed_apps)
+    si = SiHandler.from_config(resource_conf, logger)
+    vsphere_client = VSphereSDKHandler.from_config(
+        resource_config=resource_conf, reservation_info=reservation_info, logger=logger
+    )
+    dc = DcHandler.get_dc(resource_conf.default_datacenter, si)
+
+    uuids = [app.vmdetails.uid for app in deployed_apps]
+    vms = dc.get_vms_by_uuids(uuids)
+    for vm_uuid in uuids:
+        if vm_uuid not in vms:
+            logger.warning(f"Trying to remove vm {vm_uuid} but it is not exists")
+
+    def clean_up_vm(vm: VmHandler) -> None:
+        si.delete_customization_spec(vm.name)
+
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_DELETES) as executor:
+        list(executor.map(clean_up_vm, vms.values()))
+
+    soft = resource_conf.shutdown_method is ShutdownMethod.SOFT
+    errors = _power_off_vms(dc, vms.values(), soft, logger)
+    # VMs that are still running can't be destroyed
+    powered_on = [vm for vm, _ in errors]
+    errors += _delete_vms([vm for vm in vms.values() if vm not in powered_on], logger)
+
+    paths = {
+        str(get_vm_folder_path(app, resource_conf, reservation_info.reservation_id))
+        for app in deployed_apps
+    }
+    folders_removed = [_delete_folder(dc, path, None, logger) for path in paths]
+
+    if errors:
+        raise DeleteInstancesFailed(errors)
+    if vsphere_client and all(folders_removed):
+        vsphere_client.delete_reservation_tags()
+
+
+def _power_off_vms(
+    dc: DcHandler, vms: Iterable[VmHandler], soft: bool, logger: Logger
+) -> VM_ERRORS:
+    """Power off all VMs and return errors of the VMs that failed.
+
+    In soft mode guest OSes are shut down, VMs that can't shut down or don't
+    do it in time are powered off.
+    """
+    vms = [vm for vm in vms if vm.power_state is not PowerState.OFF]
+    if soft and vms:
+        shutting_down = []
+        for vm in vms:
+            try:
+                vm.power_off(soft=True, logger=logger)
+            except Exception as e:
+                logger.warning(f"Failed to shut down the {vm}: {e}")
+            else:
+                shutting_down.append(vm)
+        running = dc.wait_for_vms_powered_off(
+            shutting_down, SOFT_SHUTDOWN_TIMEOUT, logger
+        )
+        vms = [vm for vm in vms if vm not in shutting_down or vm in running]
+
+    logger.info(f"Powering off {len(vms)} VMs")
+    tasks = [vm.power_off_task() for vm in vms]
+    results = VcenterTaskWaiter(logger).wait_for_tasks(tasks)
+    return _get_errors(vms, results, "power off", logger)
+
+
+def _delete_vms(vms: Iterable[VmHandler], logger: Logger) -> VM_ERRORS:
+    """Delete all VMs and return errors of the VMs that failed."""
+    vms = list(vms)
+    logger.info(f"Deleting {len(vms)} VMs")
+    task_waiter = VcenterTaskWaiter(logger)
+    errors = []
+    for i in range(0, len(vms), MAX_PARALLEL_DELETES):
+        chunk = vms[i : i + MAX_PARALLEL_DELETES]
+        results = task_waiter.wait_for_tasks([vm.delete_task() for vm in chunk])
+        errors += _get_errors(chunk, results, "delete", logger)
+    return errors
+
+
+def _get_errors(
+    vms: list[VmHandler], results: list[TaskResult], action: str, logger: Logger
+) -> VM_ERRORS:
+    errors = []
+    for vm, result in zip(vms, results):
+        if not result.success:
+            logger.warning(f"Failed to {action} the {vm}: {result.error}")
+            errors.append((vm, result.error))
+    return errors
+
+
+def _delete_folder(
+    dc: DcHandler,
+    path: str | VcenterPath,
+    vsphere_client: VSphereSDKHandler | None,
+    logger: Logger,
+) -> bool:
+    """Delete the folder if it's empty, return whether it doesn't exist now."""
     with folder_delete_lock:
         try:
             folder = dc.get_vm_folder(path)
         except FolderNotFound:
-            pass
-        else:
-            _delete_tags(vsphere_client, folder)
+            return True
 
-            with suppress(FolderIsNotEmpty):
-                folder.destroy(logger)
+        _delete_tags(vsphere_client, folder)
+        try:
+            folder.destroy(logger)
+        except FolderIsNotEmpty:
+            return False
+        return True
@@ -179,8 +179,6 @@ class AbstractVCenterDeployVMFlow(AbstractDeployFlow):
         with self._cancellation_manager:
             self._logger.info(f"Creating VM folders for path: {vm_folder_path}")
             vm_folder = dc.get_or_create_vm_folder(vm_folder_path)
-            if self._vsphere_client is not None:
-                self._vsphere_client.assign_tags(obj=vm_folder)
 
         with self._cancellation_manager:
             vm_storage_name = deploy_app.vm_storage or conf.vm_storage
@@ -199,7 +197,8 @@ class AbstractVCenterDeployVMFlow(AbstractDeployFlow):
             )
 
             if self._vsphere_client is not None:
-                self._vsphere_client.assign_tags(obj=deployed_vm)
+                # tag the folder and the VM together
+                self._vsphere_client.assign_tags_to_objects([vm_folder, deployed_vm])
 
         self._logger.info(f"Preparing Deploy App result for the {deployed_vm}")
         return self._prepare_deploy_app_result(
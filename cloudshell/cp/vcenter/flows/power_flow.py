@@ -1,3 +1,6 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
 from datetime import datetime
 from logging import Logger
 
@@ -5,9 +8,10 @@ import attr
 
 from cloudshell.cp.vcenter.handlers.dc_handler import DcHandler
 from cloudshell.cp.vcenter.handlers.si_handler import SiHandler
-from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
+from cloudshell.cp.vcenter.handlers.vm_handler import PowerState, VmHandler, VmNotFound
 from cloudshell.cp.vcenter.models.deployed_app import BaseVCenterDeployedApp
 from cloudshell.cp.vcenter.resource_config import ShutdownMethod, VCenterResourceConfig
+from cloudshell.cp.vcenter.utils.task_waiter import VcenterTaskWaiter
 
 
 @attr.s(auto_attribs=True)
@@ -47,3 +51,72 @@ class VCenterPowerFlow:
         self._logger.info(f"Powering Off {vm}")
         soft = self._resource_config.shutdown_method is ShutdownMethod.SOFT
         vm.power_off(soft, self._logger)
+
+
+@attr.s(auto_attribs=True)
+class VCenterBatchPowerFlow:
+    """Power on or off VMs of many deployed apps together.
+
+    Tasks of all VMs run concurrently and the OS customization events of all
+    VMs are watched with one query loop.
+    """
+
+    _deployed_apps: Iterable[BaseVCenterDeployedApp]
+    _resource_config: VCenterResourceConfig
+    _logger: Logger
+
+    def _get_vms(self, si: SiHandler) -> tuple[DcHandler, list[VmHandler]]:
+        uuids = [app.vmdetails.uid for app in self._deployed_apps]
+        self._logger.info(f"Getting VMs by their UUIDs {uuids}")
+        dc = DcHandler.get_dc(self._resource_config.default_datacenter, si)
+        vms = dc.get_vms_by_uuids(uuids)
+        for uuid in uuids:
+            if uuid not in vms:
+                raise VmNotFound(dc, uuid=uuid)
+        return dc, list(vms.values())
+
+    def power_on(self):
+        si = SiHandler.from_config(self._resource_config, self._logger)
+        dc, vms = self._get_vms(si)
+        vms = [vm for vm in vms if vm.power_state is not PowerState.ON]
+        task_waiter = VcenterTaskWaiter(self._logger)
+
+        specs = [(vm, si.get_customization_spec(vm.name)) for vm in vms]
+        specs = [(vm, spec) for vm, spec in specs if spec]
+        customized_vms = []
+        try:
+            if specs:
+                self._logger.info(f"Adding Customization Specs to {len(specs)} VMs")
+                tasks = [vm.add_customization_spec_task(spec) for vm, spec in specs]
+                results = task_waiter.wait_for_tasks(tasks)
+                # applied specs aren't needed anymore even if something fails
+                customized_vms = [
+                    vm for (vm, _), result in zip(specs, results) if result.success
+                ]
+                for result in results:
+                    result.get()
+
+            begin_time = datetime.now()
+            self._logger.info(f"Powering On {len(vms)} VMs")
+            tasks = [vm.power_on_task() for vm in vms]
+            task_waiter.wait_for_tasks(tasks, fail_fast=True)
+
+            if customized_vms:
+                dc.wait_for_customization_ready(
+                    customized_vms, begin_time, self._logger
+                )
+        finally:
+            for vm in customized_vms:
+                si.delete_customization_spec(vm.name)
+
+    def power_off(self):
+        si = SiHandler.from_config(self._resource_config, self._logger)
+        _, vms = self._get_vms(si)
+        vms = [vm for vm in vms if vm.power_state is not PowerState.OFF]
+        self._logger.info(f"Powering Off {len(vms)} VMs")
+        if self._resource_config.shutdown_method is ShutdownMethod.SOFT:
+            for vm in vms:
+                vm.power_off(soft=True, logger=self._logger)
+        else:
+            tasks = [vm.power_off_task() for vm in vms]
+            VcenterTaskWaiter(self._logger).wait_for_tasks(tasks, fail_fast=True)
@@ -20,8 +20,8 @@ def refresh_ip(
     vm = dc.get_vm_by_uuid(deployed_app.vmdetails.uid)
     default_net = dc.get_network(resource_conf.holding_network)
     ip = VMNetworkActions(resource_conf, logger, cancellation_manager).get_vm_ip(
-        vm._entity,
-        default_net._entity,
+        vm,
+        default_net,
         deployed_app.ip_regex,
         deployed_app.refresh_ip_timeout,
     )
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
+from functools import partial
 from logging import Logger
 from typing import Iterable
 
@@ -62,20 +64,25 @@ class SaveRestoreAppFlow:
 
     def __attrs_post_init__(self):
         self._si = SiHandler.from_config(self._resource_conf, self._logger)
-        self._rollback_manager = RollbackCommandsManager(logger=self._logger)
         self._task_waiter = VcenterCancellationContextTaskWaiter(
             self._logger, self._cancellation_manager
         )
 
     def save_apps(self, save_actions: Iterable[SaveApp]) -> str:
         dc = DcHandler.get_dc(self._resource_conf.default_datacenter, self._si)
-        results = [self._save_app(action, dc) for action in save_actions]
+        max_workers = self._resource_conf.max_parallel_clones
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(partial(self._save_app, dc=dc), save_actions))
         return DriverResponse(results).to_driver_response_json()
 
     def delete_saved_apps(self, delete_saved_app_actions: list[DeleteSavedApp]) -> str:
         dc = DcHandler.get_dc(self._resource_conf.default_datacenter, self._si)
-        for action in delete_saved_app_actions:
-            self._delete_saved_app(action, dc)
+        vms = [
+            vm
+            for action in delete_saved_app_actions
+            for vm in self._get_saved_app_vms(action, dc)
+        ]
+        self._delete_vms(vms)
         self._delete_folders(delete_saved_app_actions, dc)
         results = [
             DeleteSavedAppResult(action.actionId) for action in delete_saved_app_actions
@@ -162,14 +169,18 @@ class SaveRestoreAppFlow:
             vm.power_off(soft=False, logger=self._logger)
 
         new_vm_name = f"Clone of {vm.name[0:32]}"
-        cloned_vm = self._clone_vm(
-            vm,
-            new_vm_name,
-            vm_resource_pool,
-            vm_storage,
-            vm_folder,
-        )
-        cloned_vm.create_snapshot(SNAPSHOT_NAME, dump_memory=False, logger=self._logger)
+        with RollbackCommandsManager(logger=self._logger) as rollback_manager:
+            cloned_vm = self._clone_vm(
+                rollback_manager,
+                vm,
+                new_vm_name,
+                vm_resource_pool,
+                vm_storage,
+                vm_folder,
+            )
+            cloned_vm.create_snapshot(
+                SNAPSHOT_NAME, dump_memory=False, logger=self._logger
+            )
 
         if vm_power_state is PowerState.ON:
             vm.power_on(self._logger)
@@ -193,6 +204,7 @@ class SaveRestoreAppFlow:
 
     def _clone_vm(
         self,
+        rollback_manager: RollbackCommandsManager,
         vm_template: VmHandler,
         vm_name: str,
         vm_resource_pool: ResourcePoolHandler,
@@ -200,7 +212,7 @@ class SaveRestoreAppFlow:
         vm_folder: FolderHandler,
     ) -> VmHandler:
         return CloneVMCommand(
-            rollback_manager=self._rollback_manager,
+            rollback_manager=rollback_manager,
             cancellation_manager=self._cancellation_manager,
             logger=self._logger,
             task_waiter=self._task_waiter,
@@ -213,16 +225,33 @@ class SaveRestoreAppFlow:
             config_spec=None,
         ).execute()
 
-    def _delete_saved_app(self, action: DeleteSavedApp, dc: DcHandler):
+    def _get_saved_app_vms(
+        self, action: DeleteSavedApp, dc: DcHandler
+    ) -> list[VmHandler]:
+        vms = []
         for artifact in action.actionParams.artifacts:
             vm_uuid = artifact.artifactRef
             with self._cancellation_manager:
                 try:
-                    vm = dc.get_vm_by_uuid(vm_uuid)
+                    vms.append(dc.get_vm_by_uuid(vm_uuid))
                 except VmNotFound:
                     continue
-            vm.power_off(soft=False, logger=self._logger, task_waiter=self._task_waiter)
-            vm.delete(self._logger, self._task_waiter)
+        return vms
+
+    def _delete_vms(self, vms: list[VmHandler]):
+        """Power off and delete all VMs, waiting for all tasks at once."""
+        power_off_tasks = []
+        for vm in vms:
+            if vm.power_state is not PowerState.OFF:
+                self._logger.info(f"Powering off the {vm}")
+                power_off_tasks.append(vm.power_off_task())
+        self._task_waiter.wait_for_tasks(power_off_tasks, fail_fast=True)
+
+        delete_tasks = []
+        for vm in vms:
+            self._logger.info(f"Deleting the {vm}")
+            delete_tasks.append(vm.delete_task())
+        self._task_waiter.wait_for_tasks(delete_tasks, fail_fast=True)
 
     def _delete_folders(
         self, delete_saved_app_actions: list[DeleteSavedApp], dc: DcHandler
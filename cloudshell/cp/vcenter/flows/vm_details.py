@@ -1,12 +1,16 @@
+from __future__ import annotations
+
 from logging import Logger
 
 from cloudshell.cp.core.cancellation_manager import CancellationContextManager
 from cloudshell.cp.core.flows import AbstractVMDetailsFlow
+from cloudshell.cp.core.request_actions import GetVMDetailsRequestActions
 from cloudshell.cp.core.request_actions.models import VmDetailsData
 
 from cloudshell.cp.vcenter.actions.vm_details import VMDetailsActions
 from cloudshell.cp.vcenter.handlers.dc_handler import DcHandler
 from cloudshell.cp.vcenter.handlers.si_handler import SiHandler
+from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler, VmNotFound
 from cloudshell.cp.vcenter.models.deployed_app import BaseVCenterDeployedApp
 from cloudshell.cp.vcenter.resource_config import VCenterResourceConfig
 
@@ -21,13 +25,38 @@ class VCenterGetVMDetailsFlow(AbstractVMDetailsFlow):
         super().__init__(logger)
         self._resource_conf = resource_conf
         self._cancellation_manager = cancellation_manager
+        self._si: SiHandler | None = None
+        self._dc: DcHandler | None = None
+        self._vms: dict[str, VmHandler] = {}
+
+    def _get_dc(self) -> DcHandler:
+        if self._dc is None:
+            self._si = SiHandler.from_config(self._resource_conf, self._logger)
+            self._dc = DcHandler.get_dc(
+                self._resource_conf.default_datacenter, self._si
+            )
+        return self._dc
+
+    def get_vm_details(self, request_actions: GetVMDetailsRequestActions) -> str:
+        """Get VM Details for all deployed apps using one batch of VMs properties."""
+        dc = self._get_dc()
+        uuids = [app.vmdetails.uid for app in request_actions.deployed_apps]
+        self._logger.info(f"Getting properties of the {len(uuids)} VMs")
+        self._vms = dc.get_vms_by_uuids(uuids)
+        return super().get_vm_details(request_actions)
 
     def _get_vm_details(self, deployed_app: BaseVCenterDeployedApp) -> VmDetailsData:
-        si = SiHandler.from_config(self._resource_conf, self._logger)
-        dc = DcHandler.get_dc(self._resource_conf.default_datacenter, si)
-        vm = dc.get_vm_by_uuid(deployed_app.vmdetails.uid)
+        dc = self._get_dc()
+        uuid = deployed_app.vmdetails.uid
+        vm = self._vms.get(uuid)
+        if vm is None:
+            try:
+                vm = dc.get_vm_by_uuid(uuid, with_properties=True)
+            except VmNotFound as e:
+                return VmDetailsData(appName=deployed_app.name, errorMessage=str(e))
+
         return VMDetailsActions(
-            si,
+            self._si,
             self._resource_conf,
             self._logger,
             self._cancellation_manager,
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
+from datetime import datetime
+from logging import Logger
+
 from pyVmomi import vim
 
 from cloudshell.cp.vcenter.exceptions import BaseVCenterException
@@ -30,7 +34,7 @@ from cloudshell.cp.vcenter.handlers.switch_handler import (
     DvSwitchNotFound,
 )
 from cloudshell.cp.vcenter.handlers.vcenter_path import VcenterPath
-from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler, VmNotFound
+from cloudshell.cp.vcenter.handlers.vm_handler import PowerState, VmHandler, VmNotFound
 
 
 class DcNotFound(BaseVCenterException):
@@ -42,10 +46,10 @@ class DcNotFound(BaseVCenterException):
 class DcHandler(ManagedEntityHandler):
     @classmethod
     def get_dc(cls, name: str, si: SiHandler) -> DcHandler:
-        for vc_dc in si.find_items(vim.Datacenter):
-            if vc_dc.name == name:
-                return DcHandler(vc_dc, si)
-        raise DcNotFound(name)
+        vc_dc = si.find_item_by_name(vim.Datacenter, name)
+        if not vc_dc:
+            raise DcNotFound(name)
+        return DcHandler(vc_dc, si)
 
     def __str__(self):
         return f"Datacenter '{self.name}'"
@@ -59,17 +63,89 @@ class DcHandler(ManagedEntityHandler):
         return [DatastoreHandler(store, self._si) for store in self._entity.datastore]
 
     def get_network(self, name: str) -> NetworkHandler | DVPortGroupHandler:
-        for network in self.networks:
-            if network.name == name:
-                return network
-        raise NetworkNotFound(self, name)
-
-    def get_vm_by_uuid(self, uuid: str) -> VmHandler:
+        vc_network = self._si.find_item_by_name(
+            vim.Network,
+            name,
+            recursive=True,
+            container=self._entity.networkFolder,
+            mirror=True,
+        )
+        if not vc_network:
+            raise NetworkNotFound(self, name)
+        return get_network_handler(vc_network, self._si)
+
+    def wait_for_network(
+        self, name: str, timeout: int = 5 * 60
+    ) -> NetworkHandler | DVPortGroupHandler:
+        vc_network = self._si.wait_for_item_by_name(
+            vim.Network,
+            name,
+            timeout,
+            recursive=True,
+            container=self._entity.networkFolder,
+        )
+        if not vc_network:
+            raise NetworkNotFound(self, name)
+        return get_network_handler(vc_network, self._si)
+
+    def get_vm_by_uuid(self, uuid: str, with_properties: bool = False) -> VmHandler:
         vm = self._si.find_by_uuid(self._entity, uuid, vm_search=True)
         if not vm:
             raise VmNotFound(self, uuid=uuid)
+        if with_properties:
+            return VmHandler.with_properties(vm, self._si)
         return VmHandler(vm, self._si)
 
+    def get_vms_by_uuids(self, uuids: Iterable[str]) -> dict[str, VmHandler]:
+        """Get VMs with prefetched properties by their UUIDs.
+
+        UUIDs of all VMs are fetched with one call and properties of the
+        requested VMs with another one. VMs that weren't found are skipped.
+        """
+        uuids = set(uuids)
+        vms_uuids = self._si.retrieve_items_properties(
+            vim.VirtualMachine, ["config.uuid"], container=self._entity.vmFolder
+        )
+        vc_vms = [
+            vc_vm for vc_vm, props in vms_uuids.items() if props["config.uuid"] in uuids
+        ]
+        if not vc_vms:
+            return {}
+
+        vms_props = self._si.retrieve_properties(
+            vc_vms, vim.VirtualMachine, VmHandler.SNAPSHOT_PROPERTIES
+        )
+        return {
+            props["config.uuid"]: VmHandler(vc_vm, self._si, properties=props)
+            for vc_vm, props in vms_props.items()
+        }
+
+    def wait_for_vms_powered_off(
+        self, vms: Iterable[VmHandler], timeout: int, logger: Logger
+    ) -> list[VmHandler]:
+        """Wait for all VMs to power off, return VMs that are still running."""
+        vms = list(vms)
+        logger.info(f"Waiting for {len(vms)} VMs to power off")
+        running = self._si.wait_for_property_value(
+            [vm._entity for vm in vms],
+            vim.VirtualMachine,
+            "runtime.powerState",
+            PowerState.OFF.value,
+            timeout,
+        )
+        return [vm for vm in vms if vm._entity in running]
+
+    def wait_for_customization_ready(
+        self, vms: Iterable[VmHandler], begin_time: datetime, logger: Logger
+    ) -> None:
+        """Wait for the OS customization of all VMs together."""
+        vms = list(vms)
+        logger.info(f"Waiting for the OS customization of {len(vms)} VMs")
+        watcher = self._si.get_customization_watcher()
+        futures = [watcher.watch(vm._entity, begin_time, logger) for vm in vms]
+        for future in futures:
+            future.result()
+
     def get_vm_by_path(self, path: str | VcenterPath) -> VmHandler:
         if not isinstance(path, VcenterPath):
             path = VcenterPath(path)
@@ -93,17 +169,16 @@ class DcHandler(ManagedEntityHandler):
         return vm_folder
 
     def get_cluster(self, name: str) -> ClusterHandler | HostHandler:
-        for vc_cluster in self._si.find_items(
-            [vim.ComputeResource, vim.ClusterComputeResource],
-            container=self._entity.hostFolder,
-        ):
-            if vc_cluster.name == name:
-                return ClusterHandler(vc_cluster, self._si)
-        for vc_host in self._si.find_items(
-            [vim.HostSystem], container=self._entity.hostFolder
-        ):
-            if vc_host.name == name:
-                return HostHandler(vc_host, self._si)
+        vc_cluster = self._si.find_item_by_name(
+            vim.ComputeResource, name, container=self._entity.hostFolder
+        )
+        if vc_cluster:
+            return ClusterHandler(vc_cluster, self._si)
+        vc_host = self._si.find_item_by_name(
+            vim.HostSystem, name, container=self._entity.hostFolder
+        )
+        if vc_host:
+            return HostHandler(vc_host, self._si)
 
         raise ClusterHostNotFound(self, name)
 
@@ -112,15 +187,21 @@ class DcHandler(ManagedEntityHandler):
             path = VcenterPath(path)
 
         datastore_name = path.pop()
-        if path:
-            entity = self.get_cluster(str(path))
-        else:
-            entity = self
-
-        for datastore in entity.datastores:
-            if datastore.name == datastore_name:
-                return datastore
-        raise DatastoreNotFound(entity, datastore_name)
+        entity = self.get_cluster(str(path)) if path else self
+        vc_datastore = self._si.find_item_by_name(
+            vim.Datastore,
+            datastore_name,
+            recursive=True,
+            container=self._entity.datastoreFolder,
+            mirror=True,
+        )
+        if not vc_datastore:
+            raise DatastoreNotFound(entity, datastore_name)
+        # datastore names are unique inside of the datacenter
+        datastore = DatastoreHandler(vc_datastore, self._si)
+        if path and datastore not in entity.datastores:
+            raise DatastoreNotFound(entity, datastore_name)
+        return datastore
 
     def get_dv_switch(self, path: VcenterPath | str) -> DvSwitchHandler:
         if not isinstance(path, VcenterPath):
@@ -137,9 +218,9 @@ class DcHandler(ManagedEntityHandler):
         raise DvSwitchNotFound(self, dvs_name)
 
     def get_resource_pool(self, name: str) -> ResourcePoolHandler:
-        for r_pool in self._si.find_items(
-            vim.ResourcePool, container=self._entity.hostFolder
-        ):
-            if r_pool.name == name:
-                return ResourcePoolHandler(r_pool, self._si)
-        raise ResourcePoolNotFound(self, name)
+        r_pool = self._si.find_item_by_name(
+            vim.ResourcePool, name, recursive=True, container=self._entity.hostFolder
+        )
+        if not r_pool:
+            raise ResourcePoolNotFound(self, name)
+        return ResourcePoolHandler(r_pool, self._si)
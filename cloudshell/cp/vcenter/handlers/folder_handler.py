@@ -35,13 +35,13 @@ class FolderHandler(ManagedEntityHandler):
         if not isinstance(path, VcenterPath):
             path = VcenterPath(path)
         vc_folder = parent
-        try:
-            for name in path:
+        for name in path:
+            if isinstance(vc_folder, vim.Folder):
+                vc_folder = si.find_item_by_name(vim.Folder, name, container=vc_folder)
+            else:
                 vc_folder = si.find_child(vc_folder, name)
-        except AttributeError:
-            raise FolderNotFound(parent, str(path))
-        if not vc_folder:
-            raise FolderNotFound(parent, str(path))
+            if not vc_folder:
+                raise FolderNotFound(parent, str(path))
 
         return cls(vc_folder, si)
 
@@ -69,7 +69,7 @@ class FolderHandler(ManagedEntityHandler):
 
     def get_or_create_folder(self, path: str | VcenterPath) -> FolderHandler:
         if not isinstance(path, VcenterPath):
-            path = VcenterPath
+            path = VcenterPath(path)
         folder = self
 
         for name in path:
@@ -91,6 +91,7 @@ class FolderHandler(ManagedEntityHandler):
         if not self.is_empty():
             raise FolderIsNotEmpty(self)
 
+        name = self.name
         task = self._entity.Destroy_Task()
         task_waiter = task_waiter or VcenterTaskWaiter(logger)
         try:
@@ -98,3 +99,5 @@ class FolderHandler(ManagedEntityHandler):
         except TaskFaultException as e:
             if "has already been deleted" not in str(e):
                 raise
+        finally:
+            self._si.invalidate_inventory(name)
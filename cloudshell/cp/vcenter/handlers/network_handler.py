@@ -97,8 +97,14 @@ class DVPortGroupHandler(ManagedEntityHandler, AbstractPortGroupHandler):
         return self._entity._wsdlName
 
     def destroy(self):
+        name = self.name
         with suppress(vim.fault.ResourceInUse, vim.fault.NotFound):
             self._entity.Destroy()
+        self._si.invalidate_inventory(name)
+
+    def destroy_task(self) -> vim.Task:
+        """Start port group deletion without waiting for it."""
+        return self._entity.Destroy_Task()
 
 
 @attr.s(auto_attribs=True)
@@ -125,6 +131,10 @@ class HostPortGroupHandler(AbstractPortGroupHandler):
     def vlan_id(self) -> int:
         return self._entity.spec.vlanId
 
+    @property
+    def is_used(self) -> bool:
+        return any(port.type == "virtualMachine" for port in self._entity.port or [])
+
     def destroy(self):
         with suppress(vim.fault.ResourceInUse, vim.fault.NotFound):
             self._host.remove_port_group(self.name)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import time
+from collections.abc import Iterable
 from logging import Logger
-from typing import Any
+from typing import Any, ClassVar, ContextManager
 
 import attr
 from pyVmomi import vim
@@ -11,11 +13,27 @@ from cloudshell.cp.vcenter.handlers.custom_spec_handler import (
     get_custom_spec_from_vim_spec,
 )
 from cloudshell.cp.vcenter.resource_config import VCenterResourceConfig
-from cloudshell.cp.vcenter.utils.client_helpers import get_si
+from cloudshell.cp.vcenter.utils.customization_watcher import CustomizationWatcher
+from cloudshell.cp.vcenter.utils.event_collector import create_event_collector
+from cloudshell.cp.vcenter.utils.property_collector import (
+    OBJECTS_PROPERTIES,
+    PropertyCollector,
+    create_property_collector,
+    destroy_views,
+    get_container_view_filter_spec,
+    get_names_map,
+    get_objects_filter_spec,
+    get_traversal_filter_spec,
+    iter_updates,
+    retrieve_properties,
+)
+from cloudshell.cp.vcenter.utils.session_pool import session_pool
 
 
 @attr.s(auto_attribs=True, slots=True, frozen=True)
 class SiHandler:
+    # max time to block in WaitForUpdatesEx before checking the timeout
+    UPDATES_WAIT_TIME: ClassVar[int] = 10
     _si: vim.ServiceInstance
 
     @classmethod
@@ -25,8 +43,10 @@ class SiHandler:
     @classmethod
     def connect(cls, host: str, user: str, password: str, logger: Logger) -> SiHandler:
         logger.info("Initializing vCenter API client SI")
-        si = get_si(host, user, password)
-        return cls(si)
+        si = session_pool.get_si(host, user, password, logger)
+        si_handler = cls(si)
+        session_pool.track(si, si_handler)
+        return si_handler
 
     @property
     def root_folder(self):
@@ -64,6 +84,159 @@ class SiHandler:
         view.DestroyView()
         return items
 
+    def retrieve_properties(
+        self, objects: Iterable[Any], vim_type, path_set: Iterable[str]
+    ) -> OBJECTS_PROPERTIES:
+        """Get properties of the given objects with a single call."""
+        filter_spec = get_objects_filter_spec(objects, vim_type, path_set)
+        collector = self._si.content.propertyCollector
+        return retrieve_properties(collector, filter_spec, path_set)
+
+    def retrieve_items_properties(
+        self, vim_type, path_set: Iterable[str], recursive=True, container=None
+    ) -> OBJECTS_PROPERTIES:
+        """Get properties of all objects of the type inside of the container."""
+        container = container or self.root_folder
+        view = self._si.content.viewManager.CreateContainerView(
+            container, [vim_type], recursive
+        )
+        try:
+            filter_spec = get_container_view_filter_spec(view, vim_type, path_set)
+            collector = self._si.content.propertyCollector
+            return retrieve_properties(collector, filter_spec, path_set)
+        finally:
+            # noinspection PyUnresolvedReferences
+            view.DestroyView()
+
+    def find_item_by_name(
+        self, vim_type, name: str, recursive=False, container=None, mirror=False
+    ) -> Any | None:
+        """Find the item by name in the inventory index of the session.
+
+        With mirror the names of the container are kept up to date by the
+        inventory mirror of the session, use it only for long-lived containers.
+        """
+
+        def get_filter_spec():
+            view = self._si.content.viewManager.CreateContainerView(
+                container or self.root_folder, [vim_type], recursive
+            )
+            return get_container_view_filter_spec(view, vim_type, ["name"])
+
+        key = (vim_type, container, recursive)
+        return self._find_in_inventory(key, name, get_filter_spec, mirror)
+
+    def find_referenced_item_by_name(
+        self, obj, path: str, vim_type, name: str
+    ) -> Any | None:
+        """Find the item referenced by the property of the object by name.
+
+        i.e. port group of the DvSwitch - (dvs, "portgroup", DVPortgroup, name)
+        """
+
+        def get_filter_spec():
+            return get_traversal_filter_spec(obj, path, vim_type, ["name"])
+
+        key = (vim_type, obj, path)
+        return self._find_in_inventory(key, name, get_filter_spec, mirror=False)
+
+    def get_referenced_items_by_names(self, obj, path: str, vim_type) -> dict[str, Any]:
+        """Get all items referenced by the property of the object by names."""
+        filter_spec = get_traversal_filter_spec(obj, path, vim_type, ["name"])
+        return self._get_items_by_names(filter_spec)
+
+    def retrieve_referenced_items_properties(
+        self, obj, path: str, vim_type, path_set: Iterable[str]
+    ) -> OBJECTS_PROPERTIES:
+        """Get properties of all items referenced by the property of the object."""
+        filter_spec = get_traversal_filter_spec(obj, path, vim_type, path_set)
+        collector = self._si.content.propertyCollector
+        return retrieve_properties(collector, filter_spec, path_set)
+
+    def _find_in_inventory(
+        self, key, name: str, get_filter_spec, mirror: bool
+    ) -> Any | None:
+        inventory = session_pool.get_inventory(self._si)
+        return inventory.find(
+            key,
+            name,
+            lambda: self._get_items_by_names(get_filter_spec()),
+            get_filter_spec if mirror else None,
+        )
+
+    def _get_items_by_names(self, filter_spec) -> dict[str, Any]:
+        try:
+            collector = self._si.content.propertyCollector
+            items = retrieve_properties(collector, filter_spec, ["name"])
+        finally:
+            destroy_views(filter_spec)
+        return get_names_map(items)
+
+    def wait_for_item_by_name(
+        self, vim_type, name: str, timeout: int, recursive=False, container=None
+    ) -> Any | None:
+        """Wait for the item with the name to appear in the container.
+
+        Changes are received with WaitForUpdatesEx, so the item is returned as
+        soon as the vCenter adds it.
+        """
+        view = self._si.content.viewManager.CreateContainerView(
+            container or self.root_folder, [vim_type], recursive
+        )
+        filter_spec = get_container_view_filter_spec(view, vim_type, ["name"])
+        deadline = time.monotonic() + timeout
+        try:
+            with self.create_property_collector() as collector:
+                collector.CreateFilter(filter_spec, partialUpdates=False)
+                max_wait = min(timeout, self.UPDATES_WAIT_TIME)
+                for updates in iter_updates(collector, max_wait):
+                    for item, changes in updates.items():
+                        if changes.get("name") == name:
+                            return item
+                    if time.monotonic() > deadline:
+                        return None
+        finally:
+            destroy_views(filter_spec)
+
+    def wait_for_property_value(
+        self, objects: Iterable, vim_type, path: str, value, timeout: int
+    ) -> list:
+        """Wait until the property of all objects gets the value.
+
+        Changes of all objects are received with one WaitForUpdatesEx loop.
+        Returns the objects that didn't get the value before the timeout.
+        """
+        objects = list(objects)
+        pending = set(objects)
+        if not pending:
+            return []
+        filter_spec = get_objects_filter_spec(objects, vim_type, [path])
+        deadline = time.monotonic() + timeout
+        with self.create_property_collector() as collector:
+            collector.CreateFilter(filter_spec, partialUpdates=False)
+            max_wait = min(timeout, self.UPDATES_WAIT_TIME)
+            for updates in iter_updates(collector, max_wait):
+                for obj, changes in updates.items():
+                    if changes.get(path) == value:
+                        pending.discard(obj)
+                if not pending or time.monotonic() > deadline:
+                    return [obj for obj in objects if obj in pending]
+
+    def invalidate_inventory(self, *names: str) -> None:
+        """Forget cached names after the inventory objects were deleted."""
+        session_pool.get_inventory(self._si).invalidate(names=names)
+
+    def get_customization_watcher(self) -> CustomizationWatcher:
+        return session_pool.get_customization_watcher(self._si)
+
+    def create_property_collector(self) -> ContextManager[PropertyCollector]:
+        return create_property_collector(self._si._stub)
+
+    def create_event_collector(
+        self, filter_spec: vim.event.EventFilterSpec
+    ) -> ContextManager[vim.event.EventHistoryCollector]:
+        return create_event_collector(self._si, filter_spec)
+
     def find_by_uuid(self, dc, uuid: str, vm_search) -> Any:
         return self._si.content.searchIndex.FindByUuid(dc, uuid, vmSearch=vm_search)
 
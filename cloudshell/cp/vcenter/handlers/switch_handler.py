@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from logging import Logger
 from typing import TYPE_CHECKING
 
@@ -11,7 +12,7 @@ from cloudshell.shell.flows.connectivity.models.connectivity_model import (
     ConnectionModeEnum,
 )
 
-from cloudshell.cp.vcenter.exceptions import BaseVCenterException
+from cloudshell.cp.vcenter.exceptions import BaseVCenterException, TaskFaultException
 from cloudshell.cp.vcenter.handlers.managed_entity_handler import ManagedEntityHandler
 from cloudshell.cp.vcenter.handlers.network_handler import (
     AbstractPortGroupHandler,
@@ -56,6 +57,24 @@ def get_vlan_spec(port_mode: ConnectionModeEnum, vlan_range: str):
     return spec(vlanId=vlan_id, inherited=False)
 
 
+@attr.s(auto_attribs=True, frozen=True)
+class PortGroupCreationResult:
+    name: str
+    port_group: DVPortGroupHandler | None = None
+    error: Exception | None = None
+    created: bool = False
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+    def get(self) -> DVPortGroupHandler:
+        """Return the port group or raise the creation error."""
+        if self.error:
+            raise self.error
+        return self.port_group
+
+
 class AbstractSwitchHandler(Protocol):
     def get_port_group(self, name: str) -> AbstractPortGroupHandler:
         raise NotImplementedError
@@ -69,7 +88,7 @@ class AbstractSwitchHandler(Protocol):
         logger: Logger,
         num_ports: int = 32,
         task_waiter: VcenterTaskWaiter | None = None,
-    ) -> None:
+    ) -> AbstractPortGroupHandler:
         raise NotImplementedError
 
 
@@ -77,16 +96,14 @@ class DvSwitchHandler(ManagedEntityHandler, AbstractSwitchHandler):
     def __str__(self) -> str:
         return f"DistributedVirtualSwitch '{self.name}'"
 
-    def create_port_group(
-        self,
+    @staticmethod
+    def _get_port_group_spec(
         dv_port_name: str,
         vlan_range: str,
         port_mode: ConnectionModeEnum,
         promiscuous_mode: bool,
-        logger: Logger,
-        num_ports: int = 32,
-        task_waiter: VcenterTaskWaiter | None = None,
-    ) -> None:
+        num_ports: int,
+    ) -> vim.dvs.DistributedVirtualPortgroup.ConfigSpec:
         port_conf_policy = (
             vim.dvs.VmwareDistributedVirtualSwitch.VmwarePortConfigPolicy(
                 securityPolicy=vim.dvs.VmwareDistributedVirtualSwitch.SecurityPolicy(
@@ -98,23 +115,114 @@ class DvSwitchHandler(ManagedEntityHandler, AbstractSwitchHandler):
                 vlan=get_vlan_spec(port_mode, vlan_range),
             )
         )
-        dv_pg_spec = vim.dvs.DistributedVirtualPortgroup.ConfigSpec(
+        return vim.dvs.DistributedVirtualPortgroup.ConfigSpec(
             name=dv_port_name,
             numPorts=num_ports,
             type=vim.dvs.DistributedVirtualPortgroup.PortgroupType.earlyBinding,
             defaultPortConfig=port_conf_policy,
         )
 
-        task = self._entity.AddDVPortgroup_Task([dv_pg_spec])
+    def create_port_group(
+        self,
+        dv_port_name: str,
+        vlan_range: str,
+        port_mode: ConnectionModeEnum,
+        promiscuous_mode: bool,
+        logger: Logger,
+        num_ports: int = 32,
+        task_waiter: VcenterTaskWaiter | None = None,
+    ) -> DVPortGroupHandler:
+        dv_pg_spec = self._get_port_group_spec(
+            dv_port_name, vlan_range, port_mode, promiscuous_mode, num_ports
+        )
+        # unlike AddDVPortgroup_Task it returns the new port group
+        task = self._entity.CreateDVPortgroup_Task(dv_pg_spec)
         logger.info(f"DV Port Group '{dv_port_name}' CREATE Task")
         task_waiter = task_waiter or VcenterTaskWaiter(logger)
-        task_waiter.wait_for_task(task)
+        vc_port_group = task_waiter.wait_for_task(task)
+        return DVPortGroupHandler(vc_port_group, self._si)
+
+    def create_port_groups(
+        self,
+        port_groups: Iterable[tuple[str, str, ConnectionModeEnum]],
+        promiscuous_mode: bool,
+        logger: Logger,
+        num_ports: int = 32,
+        task_waiter: VcenterTaskWaiter | None = None,
+    ) -> dict[str, PortGroupCreationResult]:
+        """Create missing port groups with one task.
+
+        port_groups are (name, vlan range, port mode), port groups that
+        already exist are skipped. The task creates all port groups or none of
+        them, i.e. if some name was taken by a concurrent request. Returns
+        results for the names that exist after the task, the caller has to
+        create the rest one by one.
+        """
+        port_groups = {name: (vlan, mode) for name, vlan, mode in port_groups}
+        existing = self._get_port_groups_by_names()
+        results = {
+            name: PortGroupCreationResult(name, port_group=existing[name])
+            for name in port_groups
+            if name in existing
+        }
+        specs = [
+            self._get_port_group_spec(name, vlan, mode, promiscuous_mode, num_ports)
+            for name, (vlan, mode) in port_groups.items()
+            if name not in existing
+        ]
+        if not specs:
+            return results
+
+        logger.info(f"Creating {len(specs)} DV Port Groups on the {self}")
+        task = self._entity.AddDVPortgroup_Task(specs)
+        task_waiter = task_waiter or VcenterTaskWaiter(logger)
+        try:
+            task_waiter.wait_for_task(task)
+        except TaskFaultException as e:
+            logger.warning(f"Failed to create DV Port Groups on the {self}: {e}")
+            created = False
+        else:
+            created = True
+
+        # port groups could be also created by a concurrent request
+        current = self._get_port_groups_by_names()
+        for spec in specs:
+            if spec.name in current:
+                results[spec.name] = PortGroupCreationResult(
+                    spec.name, port_group=current[spec.name], created=created
+                )
+        return results
+
+    def get_unused_port_groups(self) -> dict[str, DVPortGroupHandler]:
+        """Get port groups without VMs by names with one property fetch."""
+        port_groups = self._si.retrieve_referenced_items_properties(
+            self._entity,
+            "portgroup",
+            vim.dvs.DistributedVirtualPortgroup,
+            ["name", "vm"],
+        )
+        return {
+            props["name"]: DVPortGroupHandler(vc_port_group, self._si)
+            for vc_port_group, props in port_groups.items()
+            if not props["vm"]
+        }
+
+    def _get_port_groups_by_names(self) -> dict[str, DVPortGroupHandler]:
+        names = self._si.get_referenced_items_by_names(
+            self._entity, "portgroup", vim.dvs.DistributedVirtualPortgroup
+        )
+        return {
+            name: DVPortGroupHandler(vc_port_group, self._si)
+            for name, vc_port_group in names.items()
+        }
 
     def get_port_group(self, name: str) -> DVPortGroupHandler:
-        for port_group in self._entity.portgroup:
-            if port_group.name == name:
-                return DVPortGroupHandler(port_group, self._si)
-        raise DVPortGroupNotFound(self, name)
+        vc_port_group = self._si.find_referenced_item_by_name(
+            self._entity, "portgroup", vim.dvs.DistributedVirtualPortgroup, name
+        )
+        if not vc_port_group:
+            raise DVPortGroupNotFound(self, name)
+        return DVPortGroupHandler(vc_port_group, self._si)
 
 
 @attr.s(auto_attribs=True)
@@ -139,6 +247,14 @@ class VSwitchHandler(AbstractSwitchHandler):
                 return pg
         raise HostPortGroupNotFound(self, name)
 
+    def get_unused_port_groups(self) -> dict[str, HostPortGroupHandler]:
+        """Get port groups without VMs by names."""
+        return {
+            pg.name: pg
+            for pg in self._host.port_groups
+            if pg.v_switch_key == self.key and not pg.is_used
+        }
+
     def create_port_group(
         self,
         port_name: str,
@@ -148,7 +264,7 @@ class VSwitchHandler(AbstractSwitchHandler):
         logger: Logger,
         num_ports: int = 32,
         task_waiter: VcenterTaskWaiter | None = None,
-    ) -> None:
+    ) -> HostPortGroupHandler:
         pg_spec = vim.host.PortGroup.Specification()
         pg_spec.vswitchName = self.name
         pg_spec.name = port_name
@@ -161,3 +277,4 @@ class VSwitchHandler(AbstractSwitchHandler):
         pg_spec.policy = network_policy
 
         self._host.add_port_group(pg_spec)
+        return self.get_port_group(port_name)
@@ -18,6 +18,10 @@ def is_virtual_scsi_controller(device) -> bool:
 class VirtualDeviceHandler:
     _device: vim.vm.device.VirtualDevice
 
+    @property
+    def key(self) -> int:
+        return self._device.key
+
     @property
     def label(self) -> str:
         return self._device.deviceInfo.label
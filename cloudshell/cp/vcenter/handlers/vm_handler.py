@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+from collections.abc import Generator, Iterable
 from contextlib import suppress
 from datetime import datetime
 from enum import Enum
 from logging import Logger
+from typing import Any, ClassVar
 
+import attr
 from pyVmomi import vim
 
-from cloudshell.cp.vcenter.common.vcenter.event_manager import EventManager
 from cloudshell.cp.vcenter.exceptions import BaseVCenterException
 from cloudshell.cp.vcenter.handlers.cluster_handler import HostHandler
 from cloudshell.cp.vcenter.handlers.config_spec_handler import ConfigSpecHandler
@@ -22,6 +24,7 @@ from cloudshell.cp.vcenter.handlers.network_handler import (
     get_network_handler,
 )
 from cloudshell.cp.vcenter.handlers.resource_pool import ResourcePoolHandler
+from cloudshell.cp.vcenter.handlers.si_handler import SiHandler
 from cloudshell.cp.vcenter.handlers.snapshot_handler import (
     SnapshotHandler,
     SnapshotNotFoundInSnapshotTree,
@@ -38,6 +41,11 @@ from cloudshell.cp.vcenter.handlers.vnic_handler import (
     VnicWithMacNotFound,
     VnicWithoutNetwork,
 )
+from cloudshell.cp.vcenter.utils.property_collector import (
+    get_attr_by_path,
+    get_objects_filter_spec,
+    iter_updates,
+)
 from cloudshell.cp.vcenter.utils.task_waiter import VcenterTaskWaiter
 from cloudshell.cp.vcenter.utils.units_converter import BASE_10
 
@@ -93,19 +101,91 @@ def _get_dc(entity):
     return entity.parent
 
 
+@attr.s
 class VmHandler(ManagedEntityHandler):
+    """VM handler.
+
+    By default, every property is lazily fetched from the vCenter. A VM handler
+    created with properties serves them from the in-memory snapshot, call
+    refresh() to get the latest values.
+    """
+
+    SNAPSHOT_PROPERTIES: ClassVar[tuple[str, ...]] = (
+        "name",
+        "config.uuid",
+        "config.hardware.device",
+        "summary",
+        "guest.guestId",
+        "guest.toolsStatus",
+        "guest.ipAddress",
+        "guest.net",
+        "network",
+        "runtime.host",
+    )
     _entity: vim.VirtualMachine
+    _properties: dict[str, Any] | None = attr.ib(default=None, repr=False, eq=False)
+
+    @classmethod
+    def with_properties(cls, vc_vm: vim.VirtualMachine, si: SiHandler) -> VmHandler:
+        """Create VM handler with the properties fetched by a single call."""
+        vm = cls(vc_vm, si)
+        vm.refresh()
+        return vm
 
     def __str__(self):
         return f"VM '{self.name}'"
 
+    def refresh(self) -> None:
+        """Update properties snapshot."""
+        props = self._si.retrieve_properties(
+            [self._entity], vim.VirtualMachine, self.SNAPSHOT_PROPERTIES
+        )
+        self._properties = props[self._entity]
+
+    def iter_properties_updates(
+        self, paths: Iterable[str], max_wait_seconds: int
+    ) -> Generator[bool, None, None]:
+        """Yield whether the properties were changed and keep them in the snapshot.
+
+        Changes are received with WaitForUpdatesEx, the first update contains
+        current values. False is yielded if nothing changed for
+        max_wait_seconds, so the caller can check cancellation and timeouts.
+        """
+        filter_spec = get_objects_filter_spec(
+            [self._entity], vim.VirtualMachine, list(paths)
+        )
+        with self._si.create_property_collector() as collector:
+            collector.CreateFilter(filter_spec, partialUpdates=False)
+            for updates in iter_updates(collector, max_wait_seconds):
+                changes = updates.get(self._entity)
+                if changes:
+                    if self._properties is None:
+                        self._properties = {}
+                    self._properties.update(changes)
+                yield bool(changes)
+
+    def _get_property(self, path: str) -> Any:
+        if self._properties is not None:
+            if path in self._properties:
+                return self._properties[path]
+            for prop_path, value in self._properties.items():
+                if path.startswith(f"{prop_path}."):
+                    return get_attr_by_path(value, path[len(prop_path) + 1 :])
+        return get_attr_by_path(self._entity, path)
+
+    @property
+    def name(self) -> str:
+        return self._get_property("name")
+
     @property
     def uuid(self) -> str:
-        return self._entity.config.uuid
+        return self._get_property("config.uuid")
 
     @property
     def networks(self) -> list[NetworkHandler | DVPortGroupHandler]:
-        return [get_network_handler(net, self._si) for net in self._entity.network]
+        return [
+            get_network_handler(net, self._si) for net in self._get_property("network")
+        ]
 
     @property
     def gv_port_groups(self) -> list[DVPortGroupHandler]:
@@ -123,7 +203,7 @@ class VmHandler(ManagedEntityHandler):
 
     @property
     def host(self) -> HostHandler:
-        return HostHandler(self._entity.runtime.host, self._si)
+        return HostHandler(self._get_property("runtime.host"), self._si)
 
     @property
     def disk_size(self) -> int:
@@ -131,19 +211,28 @@ class VmHandler(ManagedEntityHandler):
 
     @property
     def num_cpu(self) -> int:
-        return self._entity.summary.config.numCpu
+        return self._get_property("summary.config.numCpu")
 
     @property
     def memory_size(self) -> int:
-        return self._entity.summary.config.memorySizeMB * BASE_10 * BASE_10
+        memory_size_mb = self._get_property("summary.config.memorySizeMB")
+        return memory_size_mb * BASE_10 * BASE_10
 
     @property
     def guest_os(self) -> str:
-        return self._entity.summary.config.guestFullName
+        return self._get_property("summary.config.guestFullName")
 
     @property
     def guest_id(self) -> str | None:
-        return self._entity.guest.guestId
+        return self._get_property("guest.guestId")
+
+    @property
+    def guest_ip_address(self) -> str | None:
+        return self._get_property("guest.ipAddress")
+
+    @property
+    def guest_net(self) -> list[vim.vm.GuestInfo.NicInfo]:
+        return self._get_property("guest.net") or []
 
     @property
     def current_snapshot(self) -> SnapshotHandler | None:
@@ -165,7 +254,7 @@ class VmHandler(ManagedEntityHandler):
 
     @property
     def power_state(self) -> PowerState:
-        return PowerState(self._entity.summary.runtime.powerState)
+        return PowerState(self._get_property("summary.runtime.powerState"))
 
     @property
     def _moId(self) -> str:
@@ -177,7 +266,7 @@ class VmHandler(ManagedEntityHandler):
         return self._entity._wsdlName
 
     def _get_devices(self):
-        return self._entity.config.hardware.device
+        return self._get_property("config.hardware.device")
 
     def create_vnic(self) -> VnicHandler:
         try:
@@ -204,6 +293,10 @@ class VmHandler(ManagedEntityHandler):
 
         return network
 
+    def network_changes(self) -> VmNetworkChanges:
+        """Queue vNIC changes to apply them with one reconfigure task."""
+        return VmNetworkChanges(self)
+
     def connect_vnic_to_port_group(
         self,
         vnic: VnicHandler,
@@ -211,11 +304,9 @@ class VmHandler(ManagedEntityHandler):
         logger: Logger,
         task_waiter: VcenterTaskWaiter | None = None,
     ) -> None:
-        nic_spec = vnic.create_spec_for_connection_port_group(port_group)
-        config_spec = vim.vm.ConfigSpec(deviceChange=[nic_spec])
-        task = self._entity.ReconfigVM_Task(config_spec)
-        task_waiter = task_waiter or VcenterTaskWaiter(logger)
-        task_waiter.wait_for_task(task)
+        changes = self.network_changes()
+        changes.connect_vnic_to_port_group(vnic, port_group)
+        changes.apply(logger, task_waiter)
 
     def connect_vnic_to_network(
         self,
@@ -224,11 +315,9 @@ class VmHandler(ManagedEntityHandler):
         logger: Logger,
         task_waiter: VcenterTaskWaiter | None = None,
     ) -> None:
-        nic_spec = vnic.create_spec_for_connection_network(network)
-        config_spec = vim.vm.ConfigSpec(deviceChange=[nic_spec])
-        task = self._entity.ReconfigVM_Task(config_spec)
-        task_waiter = task_waiter or VcenterTaskWaiter(logger)
-        task_waiter.wait_for_task(task)
+        changes = self.network_changes()
+        changes.connect_vnic_to_network(vnic, network)
+        changes.apply(logger, task_waiter)
 
     def get_vnic_by_mac(self, mac_address: str, logger: Logger) -> VnicHandler:
         logger.info(f"Searching for vNIC of the {self} with mac {mac_address}")
@@ -252,7 +341,8 @@ class VmHandler(ManagedEntityHandler):
         return self.host.get_v_switch(name)
 
     def validate_guest_tools_installed(self):
-        if self._entity.guest.toolsStatus != vim.vm.GuestInfo.ToolsStatus.toolsOk:
+        tools_status = self._get_property("guest.toolsStatus")
+        if tools_status != vim.vm.GuestInfo.ToolsStatus.toolsOk:
             raise VMWareToolsNotInstalled(self)
 
     def power_on(self, logger: Logger, task_waiter: VcenterTaskWaiter | None = None):
@@ -260,10 +350,14 @@ class VmHandler(ManagedEntityHandler):
             logger.info("VM already powered on")
         else:
             logger.info(f"Powering on the {self}")
-            task = self._entity.PowerOn()
+            task = self.power_on_task()
             task_waiter = task_waiter or VcenterTaskWaiter(logger)
             task_waiter.wait_for_task(task)
 
+    def power_on_task(self) -> vim.Task:
+        """Start power on without waiting for it."""
+        return self._entity.PowerOn()
+
     def power_off(
         self, soft: bool, logger: Logger, task_waiter: VcenterTaskWaiter | None = None
     ):
@@ -275,31 +369,32 @@ class VmHandler(ManagedEntityHandler):
                 self.validate_guest_tools_installed()
                 self._entity.ShutdownGuest()  # do not return task
             else:
-                task = self._entity.PowerOff()
+                task = self.power_off_task()
                 task_waiter = task_waiter or VcenterTaskWaiter(logger)
                 task_waiter.wait_for_task(task)
 
+    def power_off_task(self) -> vim.Task:
+        """Start hard power off without waiting for it."""
+        return self._entity.PowerOff()
+
     def add_customization_spec(
         self,
         spec: CustomSpecHandler,
         logger: Logger,
         task_waiter: VcenterTaskWaiter | None = None,
     ):
-        task = self._entity.CustomizeVM_Task(spec.spec.spec)
+        task = self.add_customization_spec_task(spec)
         task_waiter = task_waiter or VcenterTaskWaiter(logger)
         task_waiter.wait_for_task(task)
 
-    def wait_for_customization_ready(self, begin_time: datetime, logger: Logger):
-        logger.info(f"Checking for the {self} OS customization events")
-        em = EventManager()
-        em.wait_for_vm_os_customization_start_event(
-            self._si, self._entity, logger=logger, event_start_time=begin_time
-        )
+    def add_customization_spec_task(self, spec: CustomSpecHandler) -> vim.Task:
+        """Start applying the customization spec without waiting for it."""
+        return self._entity.CustomizeVM_Task(spec.spec.spec)
 
-        logger.info(f"Waiting for the {self} OS customization event to be proceeded")
-        em.wait_for_vm_os_customization_end_event(
-            self._si, self._entity, logger=logger, event_start_time=begin_time
-        )
+    def wait_for_customization_ready(self, begin_time: datetime, logger: Logger):
+        logger.info(f"Waiting for the {self} OS customization events")
+        watcher = self._si.get_customization_watcher()
+        watcher.watch(self._entity, begin_time, logger).result()
 
     def reconfigure_vm(
         self,
@@ -382,10 +477,14 @@ class VmHandler(ManagedEntityHandler):
 
     def delete(self, logger: Logger, task_waiter: VcenterTaskWaiter | None = None):
         logger.info(f"Deleting the {self}")
-        task = self._entity.Destroy_Task()
+        task = self.delete_task()
         task_waiter = task_waiter or VcenterTaskWaiter(logger)
         task_waiter.wait_for_task(task)
 
+    def delete_task(self) -> vim.Task:
+        """Start VM deletion without waiting for it."""
+        return self._entity.Destroy_Task()
+
     def clone_vm(
         self,
         vm_name: str,
@@ -419,3 +518,80 @@ class VmHandler(ManagedEntityHandler):
         if config_spec:
             new_vm.reconfigure_vm(config_spec, logger, task_waiter)
         return new_vm
+
+
+@attr.s(auto_attribs=True)
+class VmNetworkChanges:
+    """vNIC changes of the VM applied with one reconfigure task.
+
+    vCenter runs tasks of the VM one by one, so connecting several vNICs with
+    one task saves a round of the reconfiguration for every vNIC.
+    """
+
+    _vm: VmHandler
+    _vnics: list[VnicHandler] = attr.ib(init=False, factory=list)
+    _specs: list[vim.vm.device.VirtualDeviceSpec] = attr.ib(init=False, factory=list)
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    @property
+    def vnics(self) -> list[VnicHandler]:
+        return list(self._vnics)
+
+    @property
+    def new_vnics_count(self) -> int:
+        return sum(1 for spec in self._specs if self._is_add(spec))
+
+    def connect_vnic_to_port_group(
+        self, vnic: VnicHandler, port_group: DVPortGroupHandler
+    ) -> None:
+        self._queue(vnic, vnic.create_spec_for_connection_port_group(port_group))
+
+    def connect_vnic_to_network(
+        self, vnic: VnicHandler, network: NetworkHandler
+    ) -> None:
+        self._queue(vnic, vnic.create_spec_for_connection_network(network))
+
+    @staticmethod
+    def _is_add(spec: vim.vm.device.VirtualDeviceSpec) -> bool:
+        return spec.operation == vim.vm.device.VirtualDeviceSpec.Operation.add
+
+    def _queue(self, vnic: VnicHandler, spec: vim.vm.device.VirtualDeviceSpec) -> None:
+        if self._is_add(spec):
+            # new devices need different temporary keys in the same spec
+            spec.device.key = -(self.new_vnics_count + 1)
+        self._vnics.append(vnic)
+        self._specs.append(spec)
+
+    def apply(
+        self, logger: Logger, task_waiter: VcenterTaskWaiter | None = None
+    ) -> list[VnicHandler]:
+        """Apply queued changes and return vNICs in the same order.
+
+        New vNICs are read back from the VM, so they have MAC addresses
+        assigned by the vCenter.
+        """
+        if not self._specs:
+            return []
+        if self.new_vnics_count:
+            old_keys = {vnic.key for vnic in self._vm.vnics}
+
+        logger.info(f"Reconfiguring {len(self._specs)} vNIC(s) of the {self._vm}")
+        config_spec = vim.vm.ConfigSpec(deviceChange=self._specs)
+        task = self._vm._entity.ReconfigVM_Task(config_spec)
+        task_waiter = task_waiter or VcenterTaskWaiter(logger)
+        task_waiter.wait_for_task(task)
+
+        if self._vm._properties is not None:
+            self._vm.refresh()
+        if not self.new_vnics_count:
+            return self.vnics
+
+        vnics = {vnic.key: vnic for vnic in self._vm.vnics}
+        # vCenter assigns keys to the new devices in the order of the spec
+        new_keys = iter(sorted(set(vnics) - old_keys))
+        return [
+            vnics.get(next(new_keys, None), vnic) if self._is_add(spec) else vnic
+            for vnic, spec in zip(self._vnics, self._specs)
+        ]
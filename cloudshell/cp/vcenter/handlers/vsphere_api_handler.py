@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import ssl
 from abc import abstractmethod
+from collections.abc import Callable
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any
 
 import attr
 import requests
@@ -14,6 +19,10 @@ from cloudshell.cp.vcenter.exceptions import (
     VSphereAPINotFoundException,
 )
 from cloudshell.cp.vcenter.models.vsphere_tagging import CategorySpec, TagSpec
+from cloudshell.cp.vcenter.utils.keyed_lock import KeyedLock
+
+# one login at a time for every vCenter user
+_login_lock = KeyedLock()
 
 
 @attr.s(auto_attribs=True, slots=True, frozen=True)
@@ -21,7 +30,7 @@ class BaseAPIClient:
     address: str
     username: str
     password: str
-    session: requests.Session = requests.Session()
+    session: requests.Session = attr.ib(factory=requests.Session)
     scheme: str = "https"
     port: int = 443
     verify_ssl: bool = ssl.CERT_NONE
@@ -29,52 +38,48 @@ class BaseAPIClient:
     def __attrs_post_init__(self):
         self.session.verify = self.verify_ssl
         self.session.headers.update({"Content-Type": "application/json"})
-        if self.username and self.password:
-            self.session.auth = (self.username, self.password)
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
     @abstractmethod
     def _base_url(self):
         pass
 
-    def _do_get(
-        self, path: str, raise_for_status: bool = True, **kwargs: dict
+    def _do_request(
+        self, method: str, path: str, raise_for_status: bool = True, **kwargs: dict
     ) -> requests.Response:
-        """Basic GET request client method."""
         url = f"{self._base_url()}/{path}"
-        res = self.session.get(url=url, **kwargs)
+        res = self.session.request(method, url=url, **kwargs)
         raise_for_status and res.raise_for_status()
         return res
 
+    def _do_get(
+        self, path: str, raise_for_status: bool = True, **kwargs: dict
+    ) -> requests.Response:
+        """Basic GET request client method."""
+        return self._do_request("GET", path, raise_for_status, **kwargs)
+
     def _do_post(
         self, path: str, raise_for_status: bool = True, **kwargs: dict
     ) -> requests.Response:
         """Basic POST request client method."""
-        url = f"{self._base_url()}/{path}"
-        res = self.session.post(url=url, **kwargs)
-        raise_for_status and res.raise_for_status()
-        return res
+        return self._do_request("POST", path, raise_for_status, **kwargs)
 
     def _do_put(
         self, path: str, raise_for_status: bool = True, **kwargs: dict
     ) -> requests.Response:
         """Basic PUT request client method."""
-        url = f"{self._base_url()}/{path}"
-        res = self.session.put(url=url, **kwargs)
-        raise_for_status and res.raise_for_status()
-        return res
+        return self._do_request("PUT", path, raise_for_status, **kwargs)
 
     def _do_delete(
         self, path: str, raise_for_status: bool = True, **kwargs: dict
     ) -> requests.Response:
         """Basic DELETE request client method."""
-        url = f"{self._base_url()}/{path}"
-        res = self.session.delete(url=url, **kwargs)
-        raise_for_status and res.raise_for_status()
-        return res
+        return self._do_request("DELETE", path, raise_for_status, **kwargs)
 
 
 class VSphereAutomationAPI(BaseAPIClient):
+    SESSION_ID_HEADER = "vmware-api-session-id"
+
     class Decorators:
         @classmethod
         def get_data(cls, decorated):
@@ -86,19 +91,44 @@ class VSphereAutomationAPI(BaseAPIClient):
     def _base_url(self):
         return f"{self.scheme}://{self.address}:{self.port}/rest/com/vmware/cis"
 
+    def _do_request(
+        self, method: str, path: str, raise_for_status: bool = True, **kwargs: dict
+    ) -> requests.Response:
+        session_id = self.session.headers.get(self.SESSION_ID_HEADER)
+        res = super()._do_request(method, path, raise_for_status=False, **kwargs)
+        if res.status_code == 401 and path != "session":
+            # the API session expired, log in again and repeat the request
+            self._login(expired_session_id=session_id)
+            res = super()._do_request(method, path, raise_for_status=False, **kwargs)
+        raise_for_status and res.raise_for_status()
+        return res
+
+    def _login(self, expired_session_id: str | None = None) -> None:
+        with _login_lock((self.address, self.port, self.username)):
+            session_id = self.session.headers.get(self.SESSION_ID_HEADER)
+            if session_id is not None and session_id != expired_session_id:
+                # other client already logged in with the same HTTP session
+                return
+            try:
+                res = self._do_post(path="session", auth=(self.username, self.password))
+            except requests.exceptions.HTTPError as err:
+                if err.response.status_code == 401:
+                    raise VSphereAPIConnectionException(
+                        "Connection failed. Please, check credentials."
+                    )
+                elif err.response.status_code == 503:
+                    raise VSphereAPIConnectionException(
+                        "vSphere Automation API service unavailable."
+                    )
+                raise
+            self.session.headers[self.SESSION_ID_HEADER] = res.json()["value"]
+
     def connect(self):
-        """"""
-        try:
-            return self._do_post(path="session")
-        except requests.exceptions.HTTPError as err:
-            if err.response.status_code == 401:
-                raise VSphereAPIConnectionException(
-                    "Connection failed. Please, check credentials."
-                )
-            elif err.response.status_code == 503:
-                raise VSphereAPIConnectionException(
-                    "vSphere Automation API service unavailable."
-                )
+        """Log in if the HTTP session doesn't have an API session yet.
+
+        The session ID is reused until the vCenter rejects it.
+        """
+        self._login(expired_session_id=None)
 
     @Decorators.get_data
     def create_category(self, name: str):
@@ -252,6 +282,44 @@ class VSphereAutomationAPI(BaseAPIClient):
                 raise TagFaultException(
                     f"Not enough privileges to read the object {obj_type}."
                 )
+            elif err.response.status_code == 404:
+                raise VSphereAPINotFoundException(
+                    f"One of the tags {tag_ids} doesn't exist."
+                )
+
+    def attach_tag_to_multiple_objects(
+        self, tag_id: str, objects: list[tuple[str, str]]
+    ):
+        """Attaches the given tag to the input objects.
+
+        Note: you need the read privilege on each object and
+              the attach tag privilege on the tag.
+        """
+        create_association = {
+            "object_ids": [
+                {"id": obj_id, "type": obj_type} for obj_id, obj_type in objects
+            ]
+        }
+        try:
+            res = self._do_post(
+                path=f"tagging/tag-association/id:{tag_id}?~action=attach-tag-to-multiple-objects",  # noqa: E501
+                json=create_association,
+            )
+        except requests.exceptions.HTTPError as err:
+            if err.response.status_code == 401:
+                raise TagFaultException("User can not be authenticated..")
+            elif err.response.status_code == 403:
+                raise TagFaultException("Not enough privileges to attach the tag.")
+            elif err.response.status_code == 404:
+                raise VSphereAPINotFoundException(
+                    f"Tag with ID {tag_id} doesn't exist."
+                )
+        else:
+            result = res.json()["value"]
+            if not result["success"]:
+                raise TagFaultException(
+                    f"Failed to attach the tag {tag_id}: {result['error_messages']}"
+                )
 
     @Decorators.get_data
     def list_attached_tags(self, obj_id: str, obj_type: str):
@@ -300,6 +368,47 @@ class VSphereAutomationAPI(BaseAPIClient):
         else:
             return res
 
+    @Decorators.get_data
+    def list_attached_tags_on_objects(self, object_ids: list[dict[str, str]]):
+        """Get the lists of tags attached to the given objects.
+
+        Note: you need the read privilege on the input objects.
+              The lists will only contain those tags
+              for which you have the read privileges.
+        """
+        try:
+            res = self._do_post(
+                path="tagging/tag-association?~action=list-attached-tags-on-objects",
+                json={"object_ids": object_ids},
+            )
+        except requests.exceptions.HTTPError as err:
+            if err.response.status_code == 401:
+                raise TagFaultException("User can not be authenticated..")
+            elif err.response.status_code == 403:
+                raise TagFaultException("Not enough privileges to read the objects.")
+        else:
+            return res
+
+    @Decorators.get_data
+    def list_attached_objects_on_tags(self, tag_ids: list[str]):
+        """Get the lists of attached objects for the given tags.
+
+        Note: you need the read privilege on the input tags.
+              Only those objects for which you have the read privilege will be returned.
+        """
+        try:
+            res = self._do_post(
+                path="tagging/tag-association?~action=list-attached-objects-on-tags",
+                json={"tag_ids": tag_ids},
+            )
+        except requests.exceptions.HTTPError as err:
+            if err.response.status_code == 401:
+                raise TagFaultException("User can not be authenticated..")
+            elif err.response.status_code == 403:
+                raise TagFaultException("Not enough privileges to read the tags.")
+        else:
+            return res
+
     def delete_tag(self, tag_id: str):
         """Deletes an existing tag.
 
@@ -316,3 +425,70 @@ class VSphereAutomationAPI(BaseAPIClient):
                 raise VSphereAPINotFoundException(
                     f"Tag with ID {tag_id} doesn't exist."
                 )
+
+
+class AsyncVSphereAutomationAPI:
+    """Asyncio variant of the vSphere Automation API client.
+
+    Requests are made by the wrapped client in the executor, so the pooled
+    REST session, re-login and retries still apply. The executor limits the
+    number of requests in flight.
+    """
+
+    def __init__(self, client: VSphereAutomationAPI, executor: Executor):
+        self._client = client
+        self._executor = executor
+
+    async def _call(self, method: Callable, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(method, *args))
+
+    async def create_category(self, name: str):
+        return await self._call(self._client.create_category, name)
+
+    async def get_category_list(self):
+        return await self._call(self._client.get_category_list)
+
+    async def get_category_info(self, category_id: str):
+        return await self._call(self._client.get_category_info, category_id)
+
+    async def delete_category(self, category_id: str):
+        return await self._call(self._client.delete_category, category_id)
+
+    async def create_tag(self, name: str, category_id: str):
+        return await self._call(self._client.create_tag, name, category_id)
+
+    async def get_all_category_tags(self, category_id: str):
+        return await self._call(self._client.get_all_category_tags, category_id)
+
+    async def get_tag_info(self, tag_id: str):
+        return await self._call(self._client.get_tag_info, tag_id)
+
+    async def attach_multiple_tags_to_object(
+        self, obj_id: str, obj_type: str, tag_ids: list[str]
+    ):
+        return await self._call(
+            self._client.attach_multiple_tags_to_object, obj_id, obj_type, tag_ids
+        )
+
+    async def attach_tag_to_multiple_objects(
+        self, tag_id: str, objects: list[tuple[str, str]]
+    ):
+        return await self._call(
+            self._client.attach_tag_to_multiple_objects, tag_id, objects
+        )
+
+    async def list_attached_tags(self, obj_id: str, obj_type: str):
+        return await self._call(self._client.list_attached_tags, obj_id, obj_type)
+
+    async def list_attached_objects(self, tag_id: str):
+        return await self._call(self._client.list_attached_objects, tag_id)
+
+    async def list_attached_tags_on_objects(self, object_ids: list[dict[str, str]]):
+        return await self._call(self._client.list_attached_tags_on_objects, object_ids)
+
+    async def list_attached_objects_on_tags(self, tag_ids: list[str]):
+        return await self._call(self._client.list_attached_objects_on_tags, tag_ids)
+
+    async def delete_tag(self, tag_id: str):
+        return await self._call(self._client.delete_tag, tag_id)
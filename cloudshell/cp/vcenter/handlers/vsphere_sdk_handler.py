@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable, Iterable
+from functools import partial
 from logging import Logger
 from typing import Union
 
@@ -21,8 +24,14 @@ from cloudshell.cp.vcenter.handlers.network_handler import (
 from cloudshell.cp.vcenter.handlers.si_handler import SiHandler
 from cloudshell.cp.vcenter.handlers.vcenter_tag_handler import VCenterTagsManager
 from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
-from cloudshell.cp.vcenter.handlers.vsphere_api_handler import VSphereAutomationAPI
+from cloudshell.cp.vcenter.handlers.vsphere_api_handler import (
+    AsyncVSphereAutomationAPI,
+    VSphereAutomationAPI,
+)
 from cloudshell.cp.vcenter.resource_config import VCenterResourceConfig
+from cloudshell.cp.vcenter.utils.async_runner import async_runner
+from cloudshell.cp.vcenter.utils.rest_session_pool import rest_session_pool
+from cloudshell.cp.vcenter.utils.tags_cache import tags_cache
 
 OBJECTS_WITH_TAGS = Union[VmHandler, FolderHandler, NetworkHandler, DVPortGroupHandler]
 
@@ -59,6 +68,11 @@ class VSphereSDKHandler:
                 address=resource_config.address,
                 username=resource_config.user,
                 password=resource_config.password,
+                session=rest_session_pool.get_session(
+                    resource_config.address,
+                    resource_config.user,
+                    resource_config.password,
+                ),
             )
             vsphere_client.connect()
             if reservation_info is not None:
@@ -72,22 +86,50 @@ class VSphereSDKHandler:
             logger.warning(f"Tags available only from vCenter {cls.VCENTER_VERSION}")
             return
 
+    @property
+    def _address(self) -> str:
+        return self._vsphere_client.address
+
+    @property
+    def _cache_key(self) -> tuple[str, str]:
+        # users could have access to different categories and tags
+        return self._address, self._vsphere_client.username
+
+    def _call_concurrently(self, method: str, args_list: Iterable[tuple]) -> list:
+        """Make independent API calls concurrently with the asyncio client.
+
+        Results are in the order of the arguments, errors are returned as
+        results.
+        """
+
+        async def gather() -> list:
+            client = AsyncVSphereAutomationAPI(
+                self._vsphere_client, async_runner.executor
+            )
+            coros = [getattr(client, method)(*args) for args in args_list]
+            return await asyncio.gather(*coros, return_exceptions=True)
+
+        return async_runner.run(gather())
+
+    @staticmethod
+    def _raise_errors(results: list) -> list:
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    def _get_names_map(self, item_ids: list[str], get_info: str) -> dict[str, str]:
+        infos = self._call_concurrently(get_info, [(item_id,) for item_id in item_ids])
+        return {info["name"]: info["id"] for info in self._raise_errors(infos)}
+
     def _get_all_categories(self) -> dict[str:str]:
         """Get all existing categories."""
-        result = {}
         categories = self._vsphere_client.get_category_list()
-        if len(categories) > 0:
-            self._logger.debug("List of all existing categories user has access to...")
-            for category_id in categories:
-                category_info = self._vsphere_client.get_category_info(category_id)
-                self._logger.debug(
-                    f"CategoryName: {category_info['name']}, "
-                    f"CategoryID: {category_info['id']}"
-                )
-                result.update({category_info["name"]: category_info["id"]})
-        else:
+        if not categories:
             self._logger.info("No Tag Category Found...")
-
+        result = self._get_names_map(categories, "get_category_info")
+        self._logger.debug(f"All existing categories user has access to: {result}")
+        tags_cache.update(self._cache_key, result)
         return result
 
     def _get_or_create_tag_category(self, name: str) -> str:
@@ -95,6 +137,10 @@ class VSphereSDKHandler:
 
         Note: User who invokes this needs create category privilege
         """
+        category_id = tags_cache.get(self._cache_key, name)
+        if category_id is not None:
+            return category_id
+
         try:
             category_id = self._vsphere_client.create_category(name)
         except VSphereAPIAlreadyExistsException:
@@ -102,6 +148,8 @@ class VSphereSDKHandler:
             category_id = self._get_all_categories().get(name)
             if category_id is None:
                 raise TagFaultException("Error during tag category creation.")
+        else:
+            tags_cache.add(self._cache_key, name, category_id)
 
         return category_id
 
@@ -119,26 +167,25 @@ class VSphereSDKHandler:
 
     def _get_all_tags(self, category_id: str) -> dict[str:str]:
         """Get all existing tags for the given category.."""
-        result = {}
         try:
             tags = self._vsphere_client.get_all_category_tags(category_id=category_id)
-            if len(tags) > 0:
-                self._logger.debug("List of all existing tags user has access to...")
-                for tag_id in tags:
-                    tag_info = self._vsphere_client.get_tag_info(tag_id)
-                    self._logger.debug(
-                        f"TagName: {tag_info['name']}, TagID: {tag_info['id']}"
-                    )
-                    result.update({tag_info["name"]: tag_info["id"]})
-            else:
+            if not tags:
                 self._logger.info("No Tag Found...")
+            result = self._get_names_map(tags, "get_tag_info")
         except VSphereAPINotFoundException as err:
+            tags_cache.invalidate(self._address)
             raise TagFaultException(err)
         else:
+            self._logger.debug(f"All existing tags user has access to: {result}")
+            tags_cache.update((*self._cache_key, category_id), result)
             return result
 
     def _get_or_create_tag(self, name: str, category_id: str) -> str:
         """Create a Tag."""
+        tag_id = tags_cache.get((*self._cache_key, category_id), name)
+        if tag_id is not None:
+            return tag_id
+
         try:
             tag_id = self._vsphere_client.create_tag(name=name, category_id=category_id)
             if tag_id is None:
@@ -147,7 +194,11 @@ class VSphereSDKHandler:
             self._logger.debug(err)
             tag_id = self._get_all_tags(category_id=category_id).get(name)
         except VSphereAPINotFoundException as err:
+            # the category was deleted
+            tags_cache.invalidate(self._address)
             raise TagFaultException(err)
+        else:
+            tags_cache.add((*self._cache_key, category_id), name, tag_id)
 
         return tag_id
 
@@ -160,20 +211,53 @@ class VSphereSDKHandler:
             tag_ids=tag_ids, obj_id=object_id, obj_type=object_type
         )
 
-    def assign_tags(
-        self, obj: OBJECTS_WITH_TAGS, tags: dict[str:str] | None = None
-    ) -> None:
-        """Get/Create tags and assign to provided vCenter object."""
-        if not tags:
-            tags = self._tags_manager.get_default_tags()
-
+    def _get_tag_ids(self, tags: dict[str:str]) -> list[str]:
         tag_ids = []
         for category_name, tag in tags.items():
             category_id = self._get_or_create_tag_category(name=category_name)
             tag_id = self._get_or_create_tag(name=tag, category_id=category_id)
             tag_ids.append(tag_id)
+        return tag_ids
+
+    def _attach_tags(
+        self, tags: dict[str:str] | None, attach: Callable[[list[str]], None]
+    ) -> None:
+        if not tags:
+            tags = self._tags_manager.get_default_tags()
+
+        tag_ids = self._get_tag_ids(tags)
+        try:
+            attach(tag_ids)
+        except VSphereAPINotFoundException as err:
+            # cached tag or category was deleted, get the new ones
+            self._logger.debug(f"{err} Refreshing tags.")
+            tags_cache.invalidate(self._address)
+            attach(self._get_tag_ids(tags))
+
+    def assign_tags(
+        self, obj: OBJECTS_WITH_TAGS, tags: dict[str:str] | None = None
+    ) -> None:
+        """Get/Create tags and assign to provided vCenter object."""
+        self._attach_tags(tags, partial(self._create_multiple_tag_association, obj))
+
+    def assign_tags_to_objects(
+        self, objs: Iterable[OBJECTS_WITH_TAGS], tags: dict[str:str] | None = None
+    ) -> None:
+        """Get/Create tags and assign them to all provided vCenter objects.
+
+        Every tag is attached to all objects with one call.
+        """
+        objects = [self._get_object_id_and_type(obj) for obj in objs]
+        if not objects:
+            return
 
-        self._create_multiple_tag_association(obj=obj, tag_ids=tag_ids)
+        def attach(tag_ids: list[str]) -> None:
+            args_list = [(tag_id, objects) for tag_id in tag_ids]
+            self._raise_errors(
+                self._call_concurrently("attach_tag_to_multiple_objects", args_list)
+            )
+
+        self._attach_tags(tags, attach)
 
     def _get_attached_tags(self, obj: OBJECTS_WITH_TAGS) -> list[str]:
         """Determine all tags attached to vCenter object."""
@@ -241,6 +325,73 @@ class VSphereSDKHandler:
                 self._logger.debug(f"TagID to delete: {tag_id}")
                 self._delete_tag(tag_id)
 
+    def _find_tag_id(self, category_name: str, name: str) -> str | None:
+        """Find the tag ID without creating the tag or its category."""
+        category_id = tags_cache.get(self._cache_key, category_name)
+        if category_id is None:
+            category_id = self._get_all_categories().get(category_name)
+        if category_id is None:
+            return None
+
+        tag_id = tags_cache.get((*self._cache_key, category_id), name)
+        if tag_id is None:
+            try:
+                tag_id = self._get_all_tags(category_id).get(name)
+            except TagFaultException as err:
+                self._logger.debug(err)
+        return tag_id
+
+    def delete_reservation_tags(self) -> None:
+        """Delete tags that are used ONLY by objects of the current reservation.
+
+        Objects of the reservation are the objects with its sandbox tag. Tags of
+        all objects and objects of all these tags are fetched with two batch
+        calls, so the number of calls doesn't depend on the number of objects.
+        """
+        sandbox_category = VCenterTagsManager.DefaultTagNames.sandbox_id
+        reservation_id = self._tags_manager.get_default_tags()[sandbox_category]
+        sandbox_tag_id = self._find_tag_id(sandbox_category, reservation_id)
+        if sandbox_tag_id is None:
+            self._logger.debug(f"Sandbox tag {reservation_id} doesn't exist.")
+            return
+
+        try:
+            objects = self._vsphere_client.list_attached_objects(tag_id=sandbox_tag_id)
+        except VSphereAPINotFoundException:
+            self._logger.debug(f"Pattern TagID {sandbox_tag_id} doesn't exist.")
+            return
+
+        tag_ids = []
+        if objects:
+            reservation_objects = {(obj["id"], obj["type"]) for obj in objects}
+            attached_tags = self._vsphere_client.list_attached_tags_on_objects(objects)
+            candidate_ids = {
+                tag_id for item in attached_tags for tag_id in item["tag_ids"]
+            }
+            candidate_ids.discard(sandbox_tag_id)
+            if candidate_ids:
+                tags_objects = self._vsphere_client.list_attached_objects_on_tags(
+                    list(candidate_ids)
+                )
+                for item in tags_objects:
+                    tag_objects = {
+                        (obj["id"], obj["type"]) for obj in item["object_ids"]
+                    }
+                    if tag_objects <= reservation_objects:
+                        tag_ids.append(item["tag_id"])
+        tag_ids.append(sandbox_tag_id)
+
+        self._logger.debug(f"TagIDs to delete: {tag_ids}")
+        results = self._call_concurrently(
+            "delete_tag", [(tag_id,) for tag_id in tag_ids]
+        )
+        for result in results:
+            if isinstance(result, VSphereAPINotFoundException):
+                self._logger.debug(result)
+            elif isinstance(result, Exception):
+                raise result
+        tags_cache.invalidate(self._address)
+
     def _get_object_id_and_type(self, obj: OBJECTS_WITH_TAGS) -> tuple[str, str]:
         object_id = obj._moId
         object_type = obj._wsdl_name
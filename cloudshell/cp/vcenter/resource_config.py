@@ -19,6 +19,7 @@ from cloudshell.shell.standards.core.resource_config_entities import (
 )
 
 from cloudshell.cp.vcenter.constants import SHELL_NAME
+from cloudshell.cp.vcenter.exceptions import InvalidAttributeException
 
 
 class ResourceAttrROShellName(ResourceAttrRO):
@@ -40,6 +41,31 @@ class ShutdownMethodAttrRO(ResourceAttrRO):
         return ShutdownMethod(val)
 
 
+class ResourceIntAttrROShellName(ResourceAttrROShellName):
+    """Positive integer attribute, the default is used if it's empty."""
+
+    def __init__(self, name: str, default: int):
+        super().__init__(name)
+        self.default = default
+
+    def __get__(self, instance, owner) -> int:
+        val = super().__get__(instance, owner)
+        if val is self:
+            return val
+        if val is None or val == "":
+            return self.default
+        try:
+            int_val = int(val)
+        except (TypeError, ValueError):
+            int_val = 0
+        if int_val < 1:
+            raise InvalidAttributeException(
+                f"Attribute '{self.name}' should be a positive integer, "
+                f"but the value is '{val}'"
+            )
+        return int_val
+
+
 CONTEXT_TYPES = Union[
     ResourceCommandContext,
     AutoLoadCommandContext,
@@ -70,6 +96,7 @@ class VCenterAttributeNames:
     reserved_networks = "Reserved Networks"
     execution_server_selector = "Execution Server Selector"
     promiscuous_mode = "Promiscuous Mode"
+    max_parallel_clones = "Max Parallel Clones"
 
 
 class VCenterResourceConfig(GenericResourceConfig):
@@ -97,6 +124,9 @@ class VCenterResourceConfig(GenericResourceConfig):
     promiscuous_mode = ResourceBoolAttrRO(
         ATTR_NAMES.promiscuous_mode, ResourceBoolAttrRO.NAMESPACE.SHELL_NAME
     )
+    max_parallel_clones = ResourceIntAttrROShellName(
+        ATTR_NAMES.max_parallel_clones, default=5
+    )
 
     @classmethod
     def from_context(
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+from collections.abc import Coroutine
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Thread
+from typing import Any, ClassVar
+
+import attr
+
+
+@attr.s(auto_attribs=True)
+class AsyncRunner:
+    """Process-wide event loop for the asyncio clients.
+
+    The loop runs in a background thread and is created once, so sync code
+    (and code inside of another running loop) can wait for coroutines without
+    creating a loop per call. Blocking requests of the clients run in one
+    bounded thread pool, its size is the limit of requests in flight.
+    """
+
+    MAX_WORKERS: ClassVar[int] = 20
+    _max_workers: int = MAX_WORKERS
+    _loop: asyncio.AbstractEventLoop | None = attr.ib(init=False, default=None)
+    _executor: ThreadPoolExecutor | None = attr.ib(init=False, default=None)
+    _thread: Thread | None = attr.ib(init=False, default=None)
+    _lock: Lock = attr.ib(init=False, factory=Lock)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        self._start()
+        return self._executor
+
+    def _start(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+                self._loop = asyncio.new_event_loop()
+                self._loop.set_default_executor(self._executor)
+                self._thread = Thread(
+                    target=self._loop.run_forever, name="asyncio runner", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def run(self, coro: Coroutine) -> Any:
+        """Run the coroutine in the loop and wait for its result."""
+        loop = self._start()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def close(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+            executor, self._executor = self._executor, None
+            thread, self._thread = self._thread, None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+        executor.shutdown(wait=False)
+
+
+async_runner = AsyncRunner()
+atexit.register(async_runner.close)
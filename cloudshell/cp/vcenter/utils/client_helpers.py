@@ -1,11 +1,35 @@
-import atexit
+from __future__ import annotations
+
 import ssl
+import time
+from logging import Logger
+from threading import Lock
+from typing import Callable
 
-from pyVim.connect import Disconnect, SmartConnect
+from pyVim.connect import SmartConnect
 from pyVmomi import vim  # noqa
 
 from cloudshell.cp.vcenter.exceptions import LoginException
 
+CONNECTOR_CACHE_TTL = 60 * 60
+
+_connectors_cache: dict[tuple[str, int], tuple[Callable, float]] = {}
+_connectors_cache_lock = Lock()
+
+
+def _get_si_default_context(host: str, user: str, password: str, port: int):
+    """Negotiate the highest TLS version supported by both sides."""
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return SmartConnect(
+        host=host,
+        user=user,
+        pwd=password,
+        port=port,
+        sslContext=context,
+    )
+
 
 def _get_si_tls_v1(host: str, user: str, password: str, port: int):
     context = ssl.SSLContext(ssl.PROTOCOL_TLSv1)
@@ -40,18 +64,65 @@ def _get_si_without_ssl(host: str, user: str, password: str, port: int):
     )
 
 
-def get_si(host: str, user: str, password: str, port: int = 443):
-    funcs = (_get_si_tls_v1_2, _get_si_tls_v1, _get_si_without_ssl)
-    for func in funcs:
+def _get_cached_connector(host: str, port: int) -> Callable | None:
+    with _connectors_cache_lock:
+        func, expire_time = _connectors_cache.get((host, port), (None, 0))
+        if expire_time < time.monotonic():
+            _connectors_cache.pop((host, port), None)
+            func = None
+    return func
+
+
+def _cache_connector(host: str, port: int, func: Callable) -> None:
+    with _connectors_cache_lock:
+        expire_time = time.monotonic() + CONNECTOR_CACHE_TTL
+        _connectors_cache[(host, port)] = (func, expire_time)
+
+
+def _get_connectors(host: str, port: int) -> list[Callable]:
+    funcs = [
+        _get_si_default_context,
+        _get_si_tls_v1_2,
+        _get_si_tls_v1,
+        _get_si_without_ssl,
+    ]
+    cached_func = _get_cached_connector(host, port)
+    if cached_func:
+        funcs.remove(cached_func)
+        funcs.insert(0, cached_func)
+    return funcs
+
+
+def get_si(
+    host: str,
+    user: str,
+    password: str,
+    port: int = 443,
+    logger: Logger | None = None,
+):
+    for func in _get_connectors(host, port):
+        start_time = time.monotonic()
         try:
             si = func(host, user, password, port)
         except (ssl.SSLEOFError, vim.fault.HostConnectFault, ssl.SSLError, OSError):
+            if logger:
+                logger.debug(
+                    f"{func.__name__} to {host}:{port} failed in "
+                    f"{time.monotonic() - start_time:.2f}s"
+                )
             continue
         except vim.fault.InvalidLogin:
             raise LoginException("Cannot connect to the vCenter. Invalid user/password")
         else:
-            atexit.register(Disconnect, si)
+            if logger:
+                logger.debug(
+                    f"{func.__name__} to {host}:{port} succeeded in "
+                    f"{time.monotonic() - start_time:.2f}s"
+                )
+            _cache_connector(host, port, func)
             break
     else:
-        raise LoginException("Cannot login with TLSv1_2, TLSv1 and without ssl")
+        raise LoginException(
+            "Cannot login with the default SSL context, TLSv1_2, TLSv1 and without ssl"
+        )
     return si
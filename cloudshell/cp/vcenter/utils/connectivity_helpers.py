@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import re
+from typing import TYPE_CHECKING
 
 from cloudshell.cp.vcenter.exceptions import BaseVCenterException
 from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
 from cloudshell.cp.vcenter.handlers.vnic_handler import VnicHandler
 
+if TYPE_CHECKING:
+    from cloudshell.cp.vcenter.handlers.vm_handler import VmNetworkChanges
+
 MAX_DVSWITCH_LENGTH = 60
 QS_NAME_PREFIX = "QS"
 PORT_GROUP_NAME_PATTERN = re.compile(rf"{QS_NAME_PREFIX}_.+_VLAN")
@@ -21,11 +25,28 @@ def is_network_generated_name(net_name: str):
 
 
 def get_available_vnic(
-    vm: VmHandler, default_net_name: str, reserved_networks: list[str], vnic_name=None
+    vm: VmHandler,
+    default_net_name: str,
+    reserved_networks: list[str],
+    vnic_name=None,
+    queued_changes: VmNetworkChanges | None = None,
 ) -> VnicHandler:
-    for vnic in vm.vnics:
+    """Get vNIC that can be connected to a new network.
+
+    vNICs that are already queued to be changed are not available.
+    """
+    queued_keys = set()
+    new_vnics_count = 0
+    if queued_changes:
+        queued_keys = {vnic.key for vnic in queued_changes.vnics}
+        new_vnics_count = queued_changes.new_vnics_count
+
+    vnics = vm.vnics
+    for vnic in vnics:
         if vnic_name and vnic_name != vnic.label:
             continue
+        if vnic.key in queued_keys:
+            continue
 
         network = vm.get_network_from_vnic(vnic)
         if (
@@ -38,7 +59,7 @@ def get_available_vnic(
         ):
             break
     else:
-        if len(vm.vnics) >= 10:
+        if len(vnics) + new_vnics_count >= 10:
             raise BaseVCenterException("Limit of vNICs per VM is 10")
         vnic = vm.create_vnic()
     return vnic
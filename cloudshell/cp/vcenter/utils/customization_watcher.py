@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from logging import Logger
+from threading import Lock, Thread
+from typing import ClassVar
+
+import attr
+from pyVmomi import vim, vmodl
+
+from cloudshell.cp.vcenter.utils.event_collector import (
+    EventsReader,
+    create_event_collector,
+)
+from cloudshell.cp.vcenter.utils.property_collector import (
+    PropertyCollector,
+    create_property_collector,
+)
+
+# the watcher outlives the command that created it, messages about the VMs go
+# to the loggers of the waiting commands
+logger = logging.getLogger(__name__)
+
+
+@attr.s(auto_attribs=True)
+class _CustomizationWait:
+    future: Future
+    logger: Logger
+    begin_time: datetime
+    start_deadline: float
+    end_deadline: float | None = None
+
+
+@attr.s(auto_attribs=True)
+class CustomizationWatcher:
+    """Waits for the OS customization of all VMs of the session together.
+
+    One thread reads customization events of the whole inventory with one
+    EventHistoryCollector and resolves futures of the waiting VMs, so the load
+    on the vCenter doesn't depend on the number of VMs. The thread exits when
+    nothing is waited for.
+    """
+
+    START_EVENT: ClassVar[str] = "CustomizationStartedEvent"
+    END_EVENTS: ClassVar[tuple[str, ...]] = (
+        "CustomizationSucceeded",
+        "CustomizationFailed",
+        "CustomizationNetworkSetupFailed",
+        "CustomizationUnknownFailure",
+    )
+    START_EVENT_TIMEOUT: ClassVar[int] = 5 * 60
+    END_EVENT_TIMEOUT: ClassVar[int] = 20 * 60
+    # max time to block in WaitForUpdatesEx before checking the timeouts
+    MAX_WAIT_SECONDS: ClassVar[int] = 10
+    # consecutive read errors that are retried before all waits fail
+    MAX_READ_RETRIES: ClassVar[int] = 3
+    RETRY_DELAY: ClassVar[int] = 5
+    _si: vim.ServiceInstance
+    _waits: dict[vim.VirtualMachine, list[_CustomizationWait]] = attr.ib(
+        init=False, factory=dict
+    )
+    _lock: Lock = attr.ib(init=False, factory=Lock)
+    _thread: Thread | None = attr.ib(init=False, default=None)
+    _property_collector: PropertyCollector | None = attr.ib(init=False, default=None)
+    _stopped: bool = attr.ib(init=False, default=False)
+    _read_errors: int = attr.ib(init=False, default=0)
+
+    def watch(
+        self, vm: vim.VirtualMachine, begin_time: datetime, logger: Logger
+    ) -> Future:
+        """Get the future of the customization end event of the VM.
+
+        The result is None if the end event timeout is reached. If the start
+        event isn't received in time, the future fails.
+        """
+        future = Future()
+        wait = _CustomizationWait(
+            future,
+            logger,
+            begin_time.astimezone(),
+            time.monotonic() + self.START_EVENT_TIMEOUT,
+        )
+        with self._lock:
+            if self._stopped:
+                future.set_exception(RuntimeError("Customization watcher is stopped"))
+                return future
+            self._waits.setdefault(vm, []).append(wait)
+            if self._thread is None:
+                self._thread = Thread(
+                    target=self._run, name="vCenter customization watcher", daemon=True
+                )
+                self._thread.start()
+        return future
+
+    def _get_begin_time(self) -> datetime | None:
+        begin_times = [w.begin_time for waits in self._waits.values() for w in waits]
+        return min(begin_times, default=None)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                begin_time = self._get_begin_time()
+                if begin_time is None or self._stopped:
+                    self._thread = None
+                    return
+            try:
+                self._watch_events(begin_time)
+            except vmodl.fault.RequestCanceled as e:
+                self._fail_waits(e)
+            except Exception as e:
+                logger.warning(f"Customization watcher failed: {e}")
+                self._read_errors += 1
+                if self._read_errors > self.MAX_READ_RETRIES:
+                    self._read_errors = 0
+                    self._fail_waits(e)
+                else:
+                    time.sleep(self.RETRY_DELAY)
+
+    def _watch_events(self, begin_time: datetime) -> None:
+        # noinspection PyArgumentList
+        filter_spec = vim.event.EventFilterSpec(
+            entity=vim.event.EventFilterSpec.ByEntity(
+                entity=self._si.content.rootFolder, recursion="all"
+            ),
+            eventTypeId=[self.START_EVENT, *self.END_EVENTS],
+            time=vim.event.EventFilterSpec.ByTime(beginTime=begin_time),
+        )
+        with create_event_collector(
+            self._si, filter_spec
+        ) as collector, create_property_collector(self._si._stub) as property_collector:
+            events_reader = EventsReader(collector, property_collector)
+            self._property_collector = property_collector
+            try:
+                while True:
+                    events = events_reader.read()
+                    self._read_errors = 0
+                    with self._lock:
+                        self._dispatch(events)
+                        self._check_timeouts()
+                        new_begin_time = self._get_begin_time()
+                        # a new wait could need older events than we read
+                        if self._stopped or new_begin_time is None:
+                            return
+                        if new_begin_time < begin_time:
+                            return
+                    events_reader.wait(self.MAX_WAIT_SECONDS)
+            finally:
+                self._property_collector = None
+
+    def _dispatch(self, events) -> None:
+        for event in events:
+            vm = event.vm.vm if event.vm else None
+            for wait in self._waits.get(vm, []):
+                if event.createdTime < wait.begin_time:
+                    continue
+                if event._wsdlName == self.START_EVENT:
+                    if wait.end_deadline is None:
+                        wait.end_deadline = time.monotonic() + self.END_EVENT_TIMEOUT
+                else:
+                    wait.logger.info(f"Found VM '{event.vm.name}' event: {event}")
+                    wait.future.set_result(event)
+        self._remove_done_waits()
+
+    def _check_timeouts(self) -> None:
+        now = time.monotonic()
+        for vm, waits in self._waits.items():
+            for wait in waits:
+                if wait.end_deadline is None and now > wait.start_deadline:
+                    wait.logger.info(f"Timeout for VM '{vm}' start event reached")
+                    wait.future.set_exception(
+                        Exception(
+                            "Unable to Apply Customization Spec for the VM. "
+                            "See logs for the details."
+                        )
+                    )
+                elif wait.end_deadline is not None and now > wait.end_deadline:
+                    wait.logger.info(f"Timeout for VM '{vm}' end events reached")
+                    wait.future.set_result(None)
+        self._remove_done_waits()
+
+    def _remove_done_waits(self) -> None:
+        for vm, waits in list(self._waits.items()):
+            waits = [wait for wait in waits if not wait.future.done()]
+            if waits:
+                self._waits[vm] = waits
+            else:
+                del self._waits[vm]
+
+    def _fail_waits(self, error: Exception) -> None:
+        with self._lock:
+            waits, self._waits = self._waits, {}
+        for vm_waits in waits.values():
+            for wait in vm_waits:
+                wait.future.set_exception(error)
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopped = True
+            property_collector = self._property_collector
+        self._fail_waits(RuntimeError("Customization watcher is stopped"))
+        if property_collector:
+            try:
+                property_collector.CancelWaitForUpdates()
+            except Exception as e:
+                # the session could be already logged out
+                logger.debug(f"Failed to stop customization watcher: {e}")
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from collections.abc import Generator
+from contextlib import contextmanager
+
+from pyVmomi import vim
+
+from cloudshell.cp.vcenter.utils.property_collector import (
+    PropertyCollector,
+    get_objects_filter_spec,
+)
+
+
+@contextmanager
+def create_event_collector(
+    si: vim.ServiceInstance, filter_spec: vim.event.EventFilterSpec
+) -> Generator[vim.event.EventHistoryCollector, None, None]:
+    # noinspection PyUnresolvedReferences
+    collector = si.content.eventManager.CreateCollectorForEvents(filter_spec)
+    try:
+        # read matching events from the oldest one, not from the latest page
+        collector.RewindCollector()
+        yield collector
+    finally:
+        collector.DestroyCollector()
+
+
+class EventsReader:
+    """Reads only new events from the EventHistoryCollector.
+
+    Waits for the change of the latestPage of the events collector with the
+    property collector instead of polling.
+    """
+
+    READ_EVENTS_COUNT = 100
+
+    def __init__(
+        self,
+        collector: vim.event.EventHistoryCollector,
+        property_collector: PropertyCollector,
+    ):
+        self._collector = collector
+        self._property_collector = property_collector
+        self._version = ""
+        filter_spec = get_objects_filter_spec(
+            [collector], vim.event.EventHistoryCollector, ["latestPage"]
+        )
+        property_collector.CreateFilter(filter_spec, partialUpdates=False)
+        # the first call returns current values immediately
+        self.wait(0)
+
+    def read(self) -> list:
+        events = []
+        while True:
+            page = self._collector.ReadNextEvents(self.READ_EVENTS_COUNT)
+            if not page:
+                return events
+            events.extend(page)
+
+    def wait(self, seconds: int) -> None:
+        options = PropertyCollector.WaitOptions(maxWaitSeconds=seconds)
+        update_set = self._property_collector.WaitForUpdatesEx(self._version, options)
+        if update_set is not None:
+            self._version = update_set.version
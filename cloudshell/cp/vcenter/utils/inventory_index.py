@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable
+from threading import Lock
+from typing import Any, ClassVar, Dict, Hashable
+
+import attr
+from pyVmomi import vim
+
+from cloudshell.cp.vcenter.utils.inventory_mirror import InventoryMirror
+from cloudshell.cp.vcenter.utils.property_collector import PropertyCollector
+
+NAMES_MAP = Dict[str, vim.ManagedEntity]
+
+
+@attr.s(auto_attribs=True)
+class _IndexEntry:
+    items: NAMES_MAP
+    created: float = attr.ib(factory=time.monotonic)
+
+    def is_expired(self, now: float, ttl: int) -> bool:
+        return now - self.created > ttl
+
+
+@attr.s(auto_attribs=True)
+class InventoryIndex:
+    """Name to managed object maps of the vCenter inventory.
+
+    Every map is built with one PropertyCollector call and is rebuilt when it is
+    older than the ttl or when the name is missing in it, i.e. the object could
+    be created after the map was built.
+
+    If the inventory mirror is running and get_filter_spec is given, names are
+    read from the mirror first and the maps are used only for the names that
+    the mirror doesn't know about yet.
+    """
+
+    TTL: ClassVar[int] = 5 * 60
+    _ttl: int = TTL
+    _mirror: InventoryMirror | None = None
+    _entries: dict[Hashable, _IndexEntry] = attr.ib(init=False, factory=dict)
+    _lock: Lock = attr.ib(init=False, factory=Lock)
+
+    def find(
+        self,
+        key: Hashable,
+        name: str,
+        fetch: Callable[[], NAMES_MAP],
+        get_filter_spec: Callable[[], PropertyCollector.FilterSpec] | None = None,
+    ) -> Any | None:
+        if self._mirror and self._mirror.is_running and get_filter_spec:
+            obj = self._mirror.find(key, name, get_filter_spec)
+            if obj is not None:
+                return obj
+            # the update for a just created object could be on the way
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is None or entry.is_expired(time.monotonic(), self._ttl):
+            entry = self._rebuild(key, fetch)
+        elif name not in entry.items:
+            entry = self._rebuild(key, fetch)
+        return entry.items.get(name)
+
+    def _rebuild(self, key: Hashable, fetch: Callable[[], NAMES_MAP]) -> _IndexEntry:
+        entry = _IndexEntry(fetch())
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def invalidate(
+        self, key: Hashable | None = None, names: Iterable[str] = ()
+    ) -> None:
+        """Drop the maps and the names of deleted objects from the mirror."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+        if self._mirror:
+            self._mirror.forget(list(names))
+
+    def close(self) -> None:
+        if self._mirror:
+            self._mirror.stop()
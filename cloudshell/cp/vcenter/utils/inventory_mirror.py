@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable
+from threading import Lock, RLock, Thread
+from typing import Any, ClassVar, Hashable
+
+import attr
+from pyVmomi import vim, vmodl
+
+from cloudshell.cp.vcenter.utils.property_collector import (
+    PropertyCollector,
+    destroy_views,
+    get_names_map,
+    retrieve_properties,
+)
+
+# the mirror outlives the command that created it, so it doesn't use the
+# command logger
+logger = logging.getLogger(__name__)
+
+
+@attr.s(auto_attribs=True)
+class _WatchedNames:
+    by_name: dict[str, Any] = attr.ib(factory=dict)
+    by_obj: dict[Any, str] = attr.ib(factory=dict)
+
+    @classmethod
+    def from_names_map(cls, names: dict[str, Any]) -> _WatchedNames:
+        return cls(dict(names), {obj: name for name, obj in names.items()})
+
+    def set(self, obj, name: str) -> None:
+        self.remove(obj)
+        self.by_name.setdefault(name, obj)
+        self.by_obj[obj] = name
+
+    def remove(self, obj) -> None:
+        name = self.by_obj.pop(obj, None)
+        if name is not None and self.by_name.get(name) == obj:
+            del self.by_name[name]
+
+    def remove_name(self, name: str) -> None:
+        obj = self.by_name.pop(name, None)
+        if obj is not None:
+            self.by_obj.pop(obj, None)
+
+
+@attr.s(auto_attribs=True)
+class InventoryMirror:
+    """Local copy of names of the watched vCenter inventory objects.
+
+    Each watched set of objects gets a property filter, current names are read
+    once and a background thread keeps them up to date with WaitForUpdatesEx
+    version tokens. Reads don't touch the vCenter, so the load depends on the
+    rate of changes rather than on the rate of requests.
+
+    Filters and views live until the mirror is stopped, so only a fixed set of
+    keys should be watched.
+    """
+
+    MAX_WAIT_SECONDS: ClassVar[int] = 60
+    _si: vim.ServiceInstance
+    _collector: PropertyCollector | None = attr.ib(init=False, default=None)
+    _filter_specs: list[PropertyCollector.FilterSpec] = attr.ib(
+        init=False, factory=list
+    )
+    _filters: dict[PropertyCollector.Filter, Hashable] = attr.ib(
+        init=False, factory=dict
+    )
+    _names: dict[Hashable, _WatchedNames] = attr.ib(init=False, factory=dict)
+    # updates of the filters that are received before the names are read
+    _early_updates: dict[PropertyCollector.Filter, list] = attr.ib(
+        init=False, factory=dict
+    )
+    _lock: RLock = attr.ib(init=False, factory=RLock)
+    _key_locks: dict[Hashable, Lock] = attr.ib(init=False, factory=dict)
+    _thread: Thread | None = attr.ib(init=False, default=None)
+    _stopped: bool = attr.ib(init=False, default=False)
+
+    @property
+    def is_running(self) -> bool:
+        return not self._stopped
+
+    def find(
+        self,
+        key: Hashable,
+        name: str,
+        get_filter_spec: Callable[[], PropertyCollector.FilterSpec],
+    ) -> Any | None:
+        """Find the object by name, start watching the objects if needed."""
+        with self._lock:
+            if self._stopped:
+                return None
+            names = self._names.get(key)
+            if names is not None:
+                return names.by_name.get(name)
+            key_lock = self._key_locks.setdefault(key, Lock())
+
+        # reading current names is slow, other keys shouldn't wait for it
+        with key_lock:
+            with self._lock:
+                if self._stopped:
+                    return None
+                names = self._names.get(key)
+                if names is None:
+                    collector = self._get_collector()
+            if names is None:
+                names = self._watch(collector, key, get_filter_spec())
+        return names.by_name.get(name)
+
+    def _get_collector(self) -> PropertyCollector:
+        if self._collector is None:
+            content = self._si.content
+            self._collector = content.propertyCollector.CreatePropertyCollector()
+        return self._collector
+
+    def _watch(
+        self,
+        collector: PropertyCollector,
+        key: Hashable,
+        filter_spec: PropertyCollector.FilterSpec,
+    ) -> _WatchedNames:
+        with self._lock:
+            self._filter_specs.append(filter_spec)
+        vc_filter = collector.CreateFilter(filter_spec, partialUpdates=False)
+        items = retrieve_properties(collector, filter_spec, ["name"])
+        names = _WatchedNames.from_names_map(get_names_map(items))
+
+        with self._lock:
+            if self._stopped:
+                return names
+            self._filters[vc_filter] = key
+            self._names[key] = names
+            for filter_update in self._early_updates.pop(vc_filter, []):
+                self._apply_filter_update(names, filter_update)
+            if self._thread is None:
+                self._thread = Thread(
+                    target=self._run, name="vCenter inventory mirror", daemon=True
+                )
+                self._thread.start()
+        return names
+
+    def forget(self, names: Iterable[str]) -> None:
+        """Forget deleted objects before the leave updates are received.
+
+        Forgotten names are fetched by the index until they appear again.
+        """
+        with self._lock:
+            for watched_names in self._names.values():
+                for name in names:
+                    watched_names.remove_name(name)
+
+    def _run(self) -> None:
+        version = ""
+        options = PropertyCollector.WaitOptions(maxWaitSeconds=self.MAX_WAIT_SECONDS)
+        while not self._stopped:
+            try:
+                update_set = self._collector.WaitForUpdatesEx(version, options)
+            except vmodl.fault.RequestCanceled:
+                break
+            except Exception as e:
+                logger.warning(f"vCenter inventory mirror stopped: {e}")
+                self.stop()
+                break
+            if update_set is not None:
+                version = update_set.version
+                self._apply_updates(update_set)
+
+    def _apply_updates(self, update_set) -> None:
+        with self._lock:
+            for filter_update in update_set.filterSet:
+                key = self._filters.get(filter_update.filter)
+                names = self._names.get(key)
+                if names is None:
+                    self._early_updates.setdefault(filter_update.filter, []).append(
+                        filter_update
+                    )
+                else:
+                    self._apply_filter_update(names, filter_update)
+
+    @staticmethod
+    def _apply_filter_update(names: _WatchedNames, filter_update) -> None:
+        for obj_update in filter_update.objectSet:
+            if obj_update.kind == "leave":
+                names.remove(obj_update.obj)
+                continue
+            for change in obj_update.changeSet:
+                if change.name == "name":
+                    names.set(obj_update.obj, change.val)
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            collector, self._collector = self._collector, None
+            filter_specs, self._filter_specs = self._filter_specs, []
+            self._filters.clear()
+            self._names.clear()
+            self._early_updates.clear()
+
+        if collector is None:
+            return
+        try:
+            collector.CancelWaitForUpdates()
+            collector.DestroyPropertyCollector()
+            for filter_spec in filter_specs:
+                destroy_views(filter_spec)
+        except Exception as e:
+            # the session could be already logged out
+            logger.debug(f"Failed to clean up vCenter inventory mirror: {e}")
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Generator
+from contextlib import contextmanager
+from threading import Lock
+from typing import Hashable
+
+import attr
+
+
+@attr.s(auto_attribs=True)
+class KeyedLock:
+    """Separate lock for every key, i.e. for a port group name or a VM UUID."""
+
+    _locks: defaultdict[Hashable, Lock] = attr.ib(
+        init=False, factory=lambda: defaultdict(Lock)
+    )
+    _lock: Lock = attr.ib(init=False, factory=Lock)
+
+    @contextmanager
+    def __call__(self, key: Hashable) -> Generator[None, None, None]:
+        with self._lock:
+            key_lock = self._locks[key]
+        with key_lock:
+            yield
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from collections.abc import Generator, Iterable
+from contextlib import contextmanager
+from functools import reduce
+from typing import Any, Dict
+
+from pyVmomi import vim, vmodl
+
+PropertyCollector = vmodl.query.PropertyCollector
+OBJECTS_PROPERTIES = Dict[vim.ManagedObject, Dict[str, Any]]
+
+
+def get_attr_by_path(obj, path: str) -> Any:
+    """Get nested attribute by the property path, i.e. summary.config.numCpu."""
+    return reduce(getattr, path.split("."), obj)
+
+
+def get_objects_filter_spec(
+    objects: Iterable[vim.ManagedObject], vim_type, path_set: Iterable[str]
+) -> PropertyCollector.FilterSpec:
+    return PropertyCollector.FilterSpec(
+        objectSet=[
+            PropertyCollector.ObjectSpec(obj=obj, skip=False) for obj in objects
+        ],
+        propSet=[PropertyCollector.PropertySpec(type=vim_type, pathSet=list(path_set))],
+    )
+
+
+def get_container_view_filter_spec(
+    view: vim.view.ContainerView, vim_type, path_set: Iterable[str]
+) -> PropertyCollector.FilterSpec:
+    traversal_spec = PropertyCollector.TraversalSpec(
+        name="traverseEntries", path="view", skip=False, type=vim.view.ContainerView
+    )
+    obj_spec = PropertyCollector.ObjectSpec(
+        obj=view, skip=True, selectSet=[traversal_spec]
+    )
+    return PropertyCollector.FilterSpec(
+        objectSet=[obj_spec],
+        propSet=[PropertyCollector.PropertySpec(type=vim_type, pathSet=list(path_set))],
+    )
+
+
+def get_traversal_filter_spec(
+    obj: vim.ManagedObject, path: str, vim_type, path_set: Iterable[str]
+) -> PropertyCollector.FilterSpec:
+    """Filter spec for objects referenced by the property of the object."""
+    traversal_spec = PropertyCollector.TraversalSpec(
+        name=f"traverse_{path}", path=path, skip=False, type=type(obj)
+    )
+    obj_spec = PropertyCollector.ObjectSpec(
+        obj=obj, skip=True, selectSet=[traversal_spec]
+    )
+    return PropertyCollector.FilterSpec(
+        objectSet=[obj_spec],
+        propSet=[PropertyCollector.PropertySpec(type=vim_type, pathSet=list(path_set))],
+    )
+
+
+def destroy_views(filter_spec: PropertyCollector.FilterSpec) -> None:
+    for obj_spec in filter_spec.objectSet:
+        if isinstance(obj_spec.obj, vim.view.View):
+            obj_spec.obj.DestroyView()
+
+
+def get_names_map(objects: OBJECTS_PROPERTIES) -> dict[str, vim.ManagedObject]:
+    """Map names to objects, the first object wins if names are duplicated."""
+    names = {}
+    for obj, props in objects.items():
+        names.setdefault(props["name"], obj)
+    return names
+
+
+def retrieve_properties(
+    collector: PropertyCollector,
+    filter_spec: PropertyCollector.FilterSpec,
+    path_set: Iterable[str],
+) -> OBJECTS_PROPERTIES:
+    """Retrieve properties of all objects matched by the filter spec.
+
+    Unset properties are not returned by the vCenter, so we fill them with None
+    in order to distinguish them from properties that weren't requested.
+    """
+    path_set = list(path_set)
+    result = collector.RetrievePropertiesEx(
+        [filter_spec], PropertyCollector.RetrieveOptions()
+    )
+    objects = {}
+    while result:
+        for obj_content in result.objects:
+            props = dict.fromkeys(path_set)
+            props.update({prop.name: prop.val for prop in obj_content.propSet})
+            objects[obj_content.obj] = props
+        if not result.token:
+            break
+        result = collector.ContinueRetrievePropertiesEx(result.token)
+    return objects
+
+
+@contextmanager
+def create_property_collector(stub) -> Generator[PropertyCollector, None, None]:
+    """Create a private property collector for the session of the stub.
+
+    Filters and update versions belong to the collector, so waiting for the
+    updates on a private collector doesn't interfere with other threads that
+    share the same session.
+    """
+    si = vim.ServiceInstance("ServiceInstance", stub)
+    collector = si.RetrieveContent().propertyCollector.CreatePropertyCollector()
+    try:
+        yield collector
+    finally:
+        collector.DestroyPropertyCollector()
+
+
+def _parse_update_set(update_set) -> OBJECTS_PROPERTIES:
+    updates = {}
+    for filter_update in update_set.filterSet:
+        for obj_update in filter_update.objectSet:
+            changes = updates.setdefault(obj_update.obj, {})
+            for change in obj_update.changeSet:
+                changes[change.name] = getattr(change, "val", None)
+    return updates
+
+
+def iter_updates(
+    collector: PropertyCollector, max_wait_seconds: int
+) -> Generator[OBJECTS_PROPERTIES, None, None]:
+    """Yield changed properties of the objects watched by the collector filters.
+
+    The first batch contains current values of all properties. Empty dict is
+    yielded if nothing changed for max_wait_seconds, so the caller can check
+    cancellation and timeouts between the batches.
+    """
+    version = ""
+    options = PropertyCollector.WaitOptions(maxWaitSeconds=max_wait_seconds)
+    while True:
+        update_set = collector.WaitForUpdatesEx(version, options)
+        if update_set is None:
+            yield {}
+        else:
+            version = update_set.version
+            yield _parse_update_set(update_set)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import atexit
+import hashlib
+from threading import Lock
+from typing import ClassVar, Tuple
+
+import attr
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+REST_SESSION_KEY = Tuple[str, int, str, str]
+
+
+def _get_session_key(
+    host: str, user: str, password: str, port: int
+) -> REST_SESSION_KEY:
+    password_hash = hashlib.sha256(password.encode()).hexdigest()
+    return host, port, user, password_hash
+
+
+@attr.s(auto_attribs=True)
+class RestSessionPool:
+    """Process-wide pool of HTTP sessions for the vSphere Automation REST API.
+
+    Every vCenter user gets one requests.Session that is shared by all clients,
+    so the API session ID stored in its headers and the TCP connections are
+    reused between commands. The connection pool is sized for concurrent flows
+    and idempotent requests are retried with backoff when the service is
+    temporarily unavailable.
+    """
+
+    POOL_SIZE: ClassVar[int] = 20
+    RETRIES: ClassVar[int] = 3
+    BACKOFF_FACTOR: ClassVar[float] = 0.5
+    _sessions: dict[REST_SESSION_KEY, requests.Session] = attr.ib(
+        init=False, factory=dict
+    )
+    _lock: Lock = attr.ib(init=False, factory=Lock)
+
+    def _create_session(self) -> requests.Session:
+        retry = Retry(
+            total=self.RETRIES,
+            status_forcelist=[503],
+            backoff_factor=self.BACKOFF_FACTOR,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_maxsize=self.POOL_SIZE, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def get_session(
+        self, host: str, user: str, password: str, port: int = 443
+    ) -> requests.Session:
+        key = _get_session_key(host, user, password, port)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = self._create_session()
+            return session
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+rest_session_pool = RestSessionPool()
+atexit.register(rest_session_pool.close)
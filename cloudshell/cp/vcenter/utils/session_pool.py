@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import atexit
+import hashlib
+import time
+import weakref
+from collections import defaultdict
+from http.client import HTTPException
+from logging import Logger
+from threading import Lock, RLock
+from typing import ClassVar, Tuple
+
+import attr
+from pyVim.connect import Disconnect
+from pyVmomi import vim, vmodl
+
+from cloudshell.cp.vcenter.utils.client_helpers import get_si
+from cloudshell.cp.vcenter.utils.customization_watcher import CustomizationWatcher
+from cloudshell.cp.vcenter.utils.inventory_index import InventoryIndex
+from cloudshell.cp.vcenter.utils.inventory_mirror import InventoryMirror
+
+SESSION_KEY = Tuple[str, int, str, str]
+
+
+def _get_session_key(host: str, user: str, password: str, port: int) -> SESSION_KEY:
+    password_hash = hashlib.sha256(password.encode()).hexdigest()
+    return host, port, user, password_hash
+
+
+def _is_session_alive(si: vim.ServiceInstance) -> bool:
+    try:
+        return si.content.sessionManager.currentSession is not None
+    except (vim.fault.NotAuthenticated, vmodl.fault.SystemError):
+        return False
+    except (OSError, HTTPException):
+        # connection was closed or vCenter was restarted
+        return False
+
+
+@attr.s(auto_attribs=True)
+class _PooledSession:
+    si: vim.ServiceInstance
+    last_used: float = attr.ib(factory=time.monotonic)
+    users: int = 0
+    inventory: InventoryIndex = attr.ib(factory=InventoryIndex)
+    customization_watcher: CustomizationWatcher | None = None
+
+    def stop(self) -> None:
+        """Stop background objects of the session, i.e. after it expired."""
+        self.inventory.close()
+        if self.customization_watcher:
+            self.customization_watcher.stop()
+
+    def close(self) -> None:
+        self.stop()
+        Disconnect(self.si)
+
+    def is_idle(self, now: float, idle_timeout: int) -> bool:
+        return now - self.last_used > idle_timeout and not self.users
+
+
+@attr.s(auto_attribs=True)
+class SessionPool:
+    """Process-wide pool of logged in vCenter Service Instances.
+
+    Sessions are shared between commands of the same driver process. Before
+    reusing a session we check that it is still authenticated and log in again
+    if it is not. Sessions that weren't handed out for idle_timeout seconds and
+    have no tracked users left are logged out.
+
+    With mirror_inventory every session keeps a background inventory mirror of
+    the datacenter networks and datastores, it's useful for long-lived driver
+    processes.
+    """
+
+    IDLE_TIMEOUT: ClassVar[int] = 10 * 60
+    _idle_timeout: int = IDLE_TIMEOUT
+    _mirror_inventory: bool = False
+    _sessions: dict[SESSION_KEY, _PooledSession] = attr.ib(init=False, factory=dict)
+    _key_locks: defaultdict[SESSION_KEY, Lock] = attr.ib(
+        init=False, factory=lambda: defaultdict(Lock)
+    )
+    _lock: RLock = attr.ib(init=False, factory=RLock)
+    hits: int = attr.ib(init=False, default=0)
+    misses: int = attr.ib(init=False, default=0)
+    relogins: int = attr.ib(init=False, default=0)
+    evictions: int = attr.ib(init=False, default=0)
+
+    def get_si(
+        self, host: str, user: str, password: str, logger: Logger, port: int = 443
+    ) -> vim.ServiceInstance:
+        key = _get_session_key(host, user, password, port)
+        self.evict_idle(logger)
+
+        with self._lock:
+            key_lock = self._key_locks[key]
+
+        with key_lock:
+            with self._lock:
+                session = self._sessions.get(key)
+
+            if session and _is_session_alive(session.si):
+                logger.debug(f"Reusing vCenter session for {user}@{host}")
+                with self._lock:
+                    self.hits += 1
+                    session.last_used = time.monotonic()
+                return session.si
+
+            if session:
+                logger.info(f"vCenter session for {user}@{host} expired, re-login")
+            logger.info(f"Creating a new vCenter session for {user}@{host}")
+            si = get_si(host, user, password, port, logger)
+            if self._mirror_inventory:
+                inventory = InventoryIndex(mirror=InventoryMirror(si))
+            else:
+                inventory = InventoryIndex()
+            with self._lock:
+                if session:
+                    self.relogins += 1
+                else:
+                    self.misses += 1
+                self._sessions[key] = _PooledSession(si, inventory=inventory)
+            if session:
+                # waits on the expired session fail instead of hanging
+                session.stop()
+            return si
+
+    def track(self, si: vim.ServiceInstance, user: object) -> None:
+        """Keep the session alive while the user object exists."""
+        with self._lock:
+            for session in self._sessions.values():
+                if session.si is si:
+                    session.users += 1
+                    weakref.finalize(user, self._release, session)
+                    break
+
+    def get_inventory(self, si: vim.ServiceInstance) -> InventoryIndex:
+        """Get the inventory index of the pooled session.
+
+        Service Instances that don't belong to the pool get a new empty index.
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                if session.si is si:
+                    return session.inventory
+        return InventoryIndex()
+
+    def get_customization_watcher(
+        self, si: vim.ServiceInstance
+    ) -> CustomizationWatcher:
+        """Get the customization watcher shared by all users of the session.
+
+        Service Instances that don't belong to the pool get a new watcher.
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                if session.si is si:
+                    if session.customization_watcher is None:
+                        watcher = CustomizationWatcher(si)
+                        session.customization_watcher = watcher
+                    return session.customization_watcher
+        return CustomizationWatcher(si)
+
+    def _release(self, session: _PooledSession) -> None:
+        with self._lock:
+            session.users -= 1
+
+    def evict_idle(self, logger: Logger | None = None) -> None:
+        now = time.monotonic()
+        with self._lock:
+            expired = {
+                key: session
+                for key, session in self._sessions.items()
+                if session.is_idle(now, self._idle_timeout)
+            }
+            for key in expired:
+                del self._sessions[key]
+            self.evictions += len(expired)
+
+        for key, session in expired.items():
+            if logger:
+                logger.debug(f"Closing idle vCenter session for {key[2]}@{key[0]}")
+            session.close()
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "sessions": len(self._sessions),
+            "hits": self.hits,
+            "misses": self.misses,
+            "relogins": self.relogins,
+            "evictions": self.evictions,
+        }
+
+
+session_pool = SessionPool(mirror_inventory=True)
+atexit.register(session_pool.close)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import time
+from threading import Lock
+from typing import ClassVar, Hashable
+
+import attr
+
+
+@attr.s(auto_attribs=True)
+class _CacheEntry:
+    ids: dict[str, str] = attr.ib(factory=dict)
+    created: float = attr.ib(factory=time.monotonic)
+
+    def is_expired(self, now: float, ttl: int) -> bool:
+        return now - self.created > ttl
+
+
+@attr.s(auto_attribs=True)
+class TagIdsCache:
+    """Process-wide name to ID maps of the vSphere tag categories and tags.
+
+    Keys start with the vCenter address and the user name, because users see
+    different categories and tags depending on their privileges, i.e.
+    (address, user) for categories and (address, user, category_id) for tags
+    of the category. A map could miss a name,
+    so a miss means that the caller has to create or fetch the item. Maps
+    expire after the ttl and are dropped when some ID turns out to be deleted.
+    """
+
+    TTL: ClassVar[int] = 10 * 60
+    _ttl: int = TTL
+    _entries: dict[Hashable, _CacheEntry] = attr.ib(init=False, factory=dict)
+    _lock: Lock = attr.ib(init=False, factory=Lock)
+
+    def get(self, key: tuple, name: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.is_expired(time.monotonic(), self._ttl):
+                del self._entries[key]
+                return None
+            return entry.ids.get(name)
+
+    def add(self, key: tuple, name: str, item_id: str) -> None:
+        with self._lock:
+            self._entries.setdefault(key, _CacheEntry()).ids[name] = item_id
+
+    def update(self, key: tuple, ids: dict[str, str]) -> None:
+        """Replace the map with all names that were fetched."""
+        with self._lock:
+            self._entries[key] = _CacheEntry(dict(ids))
+
+    def invalidate(self, address: str) -> None:
+        """Forget all IDs of the vCenter for all users."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == address]:
+                del self._entries[key]
+
+
+tags_cache = TagIdsCache()
@@ -1,6 +1,8 @@
-import time
+from __future__ import annotations
+
+from collections.abc import Generator, Iterable
 from logging import Logger
-from typing import ClassVar
+from typing import Any, ClassVar
 
 import attr
 from pyVmomi import vim  # noqa
@@ -8,36 +10,112 @@ from pyVmomi import vim  # noqa
 from cloudshell.cp.core.cancellation_manager import CancellationContextManager
 
 from cloudshell.cp.vcenter.exceptions import TaskFaultException
+from cloudshell.cp.vcenter.utils.property_collector import (
+    create_property_collector,
+    get_objects_filter_spec,
+    iter_updates,
+)
+
+TASK_PROPERTIES = ("info.state", "info.error", "info.result")
+TASK_RUNNING_STATES = (vim.TaskInfo.State.running, vim.TaskInfo.State.queued)
+
+
+def _get_task_error_msg(error) -> str:
+    if error.faultMessage:
+        emsg = "; ".join([err.message for err in error.faultMessage])
+    elif error.msg:
+        emsg = error.msg
+    else:
+        emsg = "Task failed with some error"
+    return emsg
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class TaskResult:
+    task: vim.Task
+    result: Any = None
+    error: TaskFaultException | None = None
+
+    @classmethod
+    def from_task_info(cls, task: vim.Task, task_info: dict[str, Any]) -> TaskResult:
+        if task_info["info.state"] == vim.TaskInfo.State.success:
+            return cls(task, result=task_info["info.result"])
+        emsg = _get_task_error_msg(task_info["info.error"])
+        return cls(task, error=TaskFaultException(emsg))
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+    def get(self):
+        """Return the task result or raise the task error."""
+        if self.error:
+            raise self.error
+        return self.result
 
 
 @attr.s(auto_attribs=True)
 class VcenterTaskWaiter:
+    # max time to block in WaitForUpdatesEx before checking the task again
     DEFAULT_WAIT_TIME: ClassVar[int] = 2
     _logger: Logger
 
     def _check_task(self, task):
         pass
 
-    def wait_for_task(self, task):
-        """Wait for the vCenter task to be processed."""
-        while task.info.state in (
-            vim.TaskInfo.State.running,
-            vim.TaskInfo.State.queued,
-        ):
-            self._check_task(task)
-            time.sleep(self.DEFAULT_WAIT_TIME)
+    def iter_tasks_results(
+        self, tasks: Iterable[vim.Task]
+    ) -> Generator[TaskResult, None, None]:
+        """Yield the task results as soon as each of the tasks is finished.
+
+        All tasks are watched with one property filter, so waiting for N tasks
+        costs the same as waiting for one of them.
+        """
+        running_tasks = list(dict.fromkeys(tasks))
+        if not running_tasks:
+            return
+        tasks_info = {task: {} for task in running_tasks}
+
+        with create_property_collector(running_tasks[0]._stub) as collector:
+            filter_spec = get_objects_filter_spec(
+                running_tasks, vim.Task, TASK_PROPERTIES
+            )
+            collector.CreateFilter(filter_spec, partialUpdates=False)
 
-        if task.info.state == vim.TaskInfo.State.success:
-            return task.info.result
+            for updates in iter_updates(collector, self.DEFAULT_WAIT_TIME):
+                for task in running_tasks[:]:
+                    task_info = tasks_info[task]
+                    task_info.update(updates.get(task, {}))
+                    state = task_info.get("info.state")
+                    if state is not None and state not in TASK_RUNNING_STATES:
+                        running_tasks.remove(task)
+                        yield TaskResult.from_task_info(task, task_info)
 
-        if task.info.error.faultMessage:
-            emsg = "; ".join([err.message for err in task.info.error.faultMessage])
-        elif task.info.error.msg:
-            emsg = task.info.error.msg
-        else:
-            emsg = "Task failed with some error"
+                if not running_tasks:
+                    return
+                for task in running_tasks:
+                    self._check_task(task)
 
-        raise TaskFaultException(emsg)
+    def wait_for_tasks(
+        self, tasks: Iterable[vim.Task], fail_fast: bool = False
+    ) -> list[TaskResult]:
+        """Wait for all tasks and return their results in the same order.
+
+        With fail_fast the first failed task error is raised immediately without
+        waiting for other tasks.
+        """
+        tasks = list(tasks)
+        results = {}
+        for task_result in self.iter_tasks_results(tasks):
+            if fail_fast and not task_result.success:
+                raise task_result.error
+            results[task_result.task] = task_result
+        return [results[task] for task in tasks]
+
+    def wait_for_task(self, task):
+        """Wait for the vCenter task to be processed."""
+        [task_result] = self.wait_for_tasks([task])
+        return task_result.get()
 
 
 class VcenterCancellationContextTaskWaiter(VcenterTaskWaiter):
@@ -50,12 +128,10 @@ class VcenterCancellationContextTaskWaiter(VcenterTaskWaiter):
         self._cancellation_manager = cancellation_manager
 
     def _check_task(self, task):
-        if all(
-            [
-                task.info.cancelable,
-                self._cancellation_manager.cancellation_context.is_cancelled,
-                not task.info.cancelled,
-            ]
+        if (
+            self._cancellation_manager.cancellation_context.is_cancelled
+            and task.info.cancelable
+            and not task.info.cancelled
         ):
             # todo: check cancellation from the CloudShell portal
             task.CancelTask()
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pyVmomi import vim
+
+from cloudshell.cp.vcenter.utils.customization_watcher import CustomizationWatcher
+
+BEGIN_TIME = datetime(2022, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def _event(event_cls, vm, minutes=1):
+    return event_cls(
+        vm=vim.event.VmEventArgument(vm=vm),
+        createdTime=BEGIN_TIME + timedelta(minutes=minutes),
+    )
+
+
+@pytest.fixture()
+def watcher():
+    with patch("cloudshell.cp.vcenter.utils.customization_watcher.Thread") as thread:
+        yield CustomizationWatcher(MagicMock())
+    thread.return_value.start.assert_called_once_with()
+
+
+def test_events_dispatched_to_vms_futures(watcher):
+    vm1, vm2 = vim.VirtualMachine("vm-1"), vim.VirtualMachine("vm-2")
+    future1 = watcher.watch(vm1, BEGIN_TIME, MagicMock())
+    future2 = watcher.watch(vm2, BEGIN_TIME, MagicMock())
+    end1 = _event(vim.event.CustomizationSucceeded, vm1)
+
+    watcher._dispatch(
+        [
+            _event(vim.event.CustomizationFailed, vm2, minutes=-1),
+            _event(vim.event.CustomizationStartedEvent, vm1),
+            _event(vim.event.CustomizationStartedEvent, vm2),
+            end1,
+        ]
+    )
+
+    assert future1.result(0) == end1
+    assert not future2.done()
+    assert list(watcher._waits) == [vm2]
+
+
+def test_start_event_timeout(watcher):
+    vm = vim.VirtualMachine("vm-1")
+    future = watcher.watch(vm, BEGIN_TIME, MagicMock())
+    watcher._waits[vm][0].start_deadline = 0
+
+    watcher._check_timeouts()
+
+    with pytest.raises(Exception, match="Unable to Apply Customization Spec"):
+        future.result(0)
+    assert not watcher._waits
+
+
+@patch("cloudshell.cp.vcenter.utils.customization_watcher.time.sleep")
+def test_read_errors_retried(sleep, watcher):
+    vm = vim.VirtualMachine("vm-1")
+    future = watcher.watch(vm, BEGIN_TIME, MagicMock())
+    end = _event(vim.event.CustomizationSucceeded, vm)
+    errors = [Exception("Connection reset")] * watcher.MAX_READ_RETRIES
+
+    def watch_events(begin_time):
+        if errors:
+            raise errors.pop()
+        watcher._dispatch([end])
+
+    with patch.object(watcher, "_watch_events", side_effect=watch_events):
+        watcher._run()
+
+    assert future.result(0) == end
+    assert sleep.call_count == watcher.MAX_READ_RETRIES
+
+
+@patch("cloudshell.cp.vcenter.utils.customization_watcher.time.sleep")
+def test_waits_fail_after_read_retries(sleep, watcher):
+    future = watcher.watch(vim.VirtualMachine("vm-1"), BEGIN_TIME, MagicMock())
+    error = Exception("Connection reset")
+
+    with patch.object(watcher, "_watch_events", side_effect=error) as watch_events:
+        watcher._run()
+
+    assert future.exception(0) is error
+    assert watch_events.call_count == watcher.MAX_READ_RETRIES + 1
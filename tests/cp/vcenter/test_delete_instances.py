@@ -0,0 +1,83 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pyVmomi import vim
+
+from cloudshell.cp.vcenter.exceptions import TaskFaultException
+from cloudshell.cp.vcenter.flows.delete_instance import (
+    DeleteInstancesFailed,
+    delete_instances,
+)
+from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
+from cloudshell.cp.vcenter.resource_config import ShutdownMethod
+from cloudshell.cp.vcenter.utils.task_waiter import TaskResult
+
+MODULE = "cloudshell.cp.vcenter.flows.delete_instance"
+
+
+def _vm(name: str) -> VmHandler:
+    properties = {"name": name, "summary.runtime.powerState": "poweredOn"}
+    return VmHandler(vim.VirtualMachine(name), MagicMock(), properties)
+
+
+@pytest.fixture()
+def dc():
+    with patch(f"{MODULE}.DcHandler") as dc_handler, patch(f"{MODULE}.SiHandler"):
+        yield dc_handler.get_dc.return_value
+
+
+@pytest.fixture()
+def vsphere_client():
+    with patch(f"{MODULE}.VSphereSDKHandler") as handler:
+        yield handler.from_config.return_value
+
+
+@pytest.fixture()
+def task_waiter():
+    with patch(f"{MODULE}.VcenterTaskWaiter") as task_waiter_class:
+        task_waiter = task_waiter_class.return_value
+        task_waiter.wait_for_tasks.side_effect = lambda tasks: [
+            TaskResult(task) for task in tasks
+        ]
+        yield task_waiter
+
+
+@pytest.fixture()
+def vms(dc):
+    vms = {"uuid-1": _vm("vm-1"), "uuid-2": _vm("vm-2")}
+    dc.get_vms_by_uuids.return_value = vms
+    with patch.object(VmHandler, "power_off"), patch.object(
+        VmHandler, "power_off_task"
+    ), patch.object(VmHandler, "delete_task"), patch(f"{MODULE}.get_vm_folder_path"):
+        yield vms
+
+
+def _delete(vms, shutdown_method=ShutdownMethod.SOFT):
+    apps = [MagicMock(vmdetails=MagicMock(uid=uuid)) for uuid in vms]
+    conf = MagicMock(shutdown_method=shutdown_method)
+    delete_instances(apps, conf, MagicMock(), MagicMock())
+
+
+def test_vms_not_shut_down_in_time_powered_off(dc, vsphere_client, task_waiter, vms):
+    dc.wait_for_vms_powered_off.return_value = [vms["uuid-2"]]
+
+    _delete(vms)
+
+    assert VmHandler.power_off.call_count == 2
+    VmHandler.power_off_task.assert_called_once_with()
+    assert VmHandler.delete_task.call_count == 2
+    vsphere_client.delete_reservation_tags.assert_called_once_with()
+
+
+def test_reservation_tags_kept_if_vm_not_deleted(dc, vsphere_client, task_waiter, vms):
+    error = TaskFaultException("Failed")
+    task_waiter.wait_for_tasks.side_effect = lambda tasks: [
+        TaskResult(task, error=error if i else None) for i, task in enumerate(tasks)
+    ]
+
+    with pytest.raises(DeleteInstancesFailed, match="vm-2"):
+        _delete(vms, ShutdownMethod.HARD)
+
+    # the VM that failed to power off isn't destroyed
+    VmHandler.delete_task.assert_called_once_with()
+    vsphere_client.delete_reservation_tags.assert_not_called()
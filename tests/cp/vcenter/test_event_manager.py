@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from pyVmomi import vim
+
+from cloudshell.cp.vcenter.common.vcenter.event_manager import EventManager
+
+BEGIN_TIME = datetime(2022, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def _event(event_cls, vm, minutes=1):
+    return event_cls(
+        vm=vim.event.VmEventArgument(vm=vm),
+        createdTime=BEGIN_TIME + timedelta(minutes=minutes),
+    )
+
+
+def test_end_event_read_with_history_collector():
+    vm = MagicMock(spec=vim.VirtualMachine("vm-1"))
+    end = _event(vim.event.CustomizationSucceeded, vim.VirtualMachine("vm-1"))
+    si = MagicMock()
+    collector = MagicMock(spec=vim.event.EventHistoryCollector("collector"))
+    si.create_event_collector.return_value.__enter__.return_value = collector
+    collector.ReadNextEvents.side_effect = [[], [end], []]
+    property_collector = si.create_property_collector.return_value.__enter__()
+
+    event = EventManager().wait_for_vm_os_customization_end_event(
+        si, vm, MagicMock(), event_start_time=BEGIN_TIME
+    )
+
+    assert event == end
+    si.query_event.assert_not_called()
+    [filter_spec] = si.create_event_collector.call_args.args
+    assert filter_spec.time.beginTime == BEGIN_TIME
+    # initial values and one wait for the latestPage change
+    assert property_collector.WaitForUpdatesEx.call_count == 2
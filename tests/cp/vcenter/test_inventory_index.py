@@ -0,0 +1,30 @@
+from unittest.mock import MagicMock
+
+from cloudshell.cp.vcenter.utils.inventory_index import InventoryIndex
+
+
+def test_names_map_is_cached():
+    index = InventoryIndex()
+    fetch = MagicMock(return_value={"dc": "vc_dc"})
+
+    assert index.find("key", "dc", fetch) == "vc_dc"
+    assert index.find("key", "dc", fetch) == "vc_dc"
+    fetch.assert_called_once_with()
+
+
+def test_names_map_rebuilt_on_miss():
+    index = InventoryIndex()
+    fetch = MagicMock(side_effect=[{"dc": "vc_dc"}, {"dc": "vc_dc", "new": "vc_new"}])
+
+    index.find("key", "dc", fetch)
+
+    assert index.find("key", "new", fetch) == "vc_new"
+    assert fetch.call_count == 2
+
+
+def test_expired_names_map_rebuilt():
+    index = InventoryIndex(ttl=-1)
+    fetch = MagicMock(side_effect=[{"dc": "vc_dc"}, {}])
+
+    assert index.find("key", "dc", fetch) == "vc_dc"
+    assert index.find("key", "dc", fetch) is None
@@ -0,0 +1,82 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cloudshell.cp.vcenter.utils.inventory_index import InventoryIndex
+from cloudshell.cp.vcenter.utils.inventory_mirror import InventoryMirror
+
+
+def _update_set(vc_filter, kind, obj, name=None):
+    change_set = [MagicMock(val=name)] if name else []
+    for change in change_set:
+        change.name = "name"
+    obj_update = MagicMock(kind=kind, obj=obj, changeSet=change_set)
+    filter_update = MagicMock(filter=vc_filter, objectSet=[obj_update])
+    return MagicMock(filterSet=[filter_update])
+
+
+@pytest.fixture()
+def mirror():
+    mirror = InventoryMirror(MagicMock())
+    with patch(
+        "cloudshell.cp.vcenter.utils.inventory_mirror.retrieve_properties"
+    ) as retrieve, patch(
+        "cloudshell.cp.vcenter.utils.inventory_mirror.Thread"
+    ) as thread:
+        retrieve.return_value = {"vc_dc": {"name": "dc"}}
+        yield mirror
+    thread.return_value.start.assert_called_once_with()
+
+
+def test_names_read_once(mirror):
+    get_filter_spec = MagicMock()
+
+    assert mirror.find("key", "dc", get_filter_spec) == "vc_dc"
+    assert mirror.find("key", "dc", get_filter_spec) == "vc_dc"
+    get_filter_spec.assert_called_once_with()
+
+
+def test_names_updated(mirror):
+    mirror.find("key", "dc", MagicMock())
+    vc_filter = mirror._collector.CreateFilter.return_value
+
+    mirror._apply_updates(_update_set(vc_filter, "enter", "vc_new", "new"))
+    mirror._apply_updates(_update_set(vc_filter, "modify", "vc_dc", "renamed"))
+
+    assert mirror.find("key", "new", MagicMock()) == "vc_new"
+    assert mirror.find("key", "renamed", MagicMock()) == "vc_dc"
+    assert mirror.find("key", "dc", MagicMock()) is None
+
+    mirror._apply_updates(_update_set(vc_filter, "leave", "vc_new"))
+    assert mirror.find("key", "new", MagicMock()) is None
+
+
+def test_invalidated_names_fetched_with_mirror(mirror):
+    index = InventoryIndex(mirror=mirror)
+    get_filter_spec = MagicMock()
+    fetch = MagicMock(return_value={})
+
+    assert index.find("key", "dc", fetch, get_filter_spec) == "vc_dc"
+    fetch.assert_not_called()
+
+    index.invalidate(names=["dc"])
+
+    assert index.find("key", "dc", fetch, get_filter_spec) is None
+    fetch.assert_called_once_with()
+
+
+def test_fetched_names_cached_with_mirror(mirror):
+    index = InventoryIndex(mirror=mirror)
+    fetch = MagicMock(return_value={"new": "vc_new"})
+
+    assert index.find("key", "new", fetch, MagicMock()) == "vc_new"
+    assert index.find("key", "new", fetch, MagicMock()) == "vc_new"
+    fetch.assert_called_once_with()
+
+
+def test_updates_received_before_names_read_applied(mirror):
+    vc_filter = mirror._get_collector().CreateFilter.return_value
+    mirror._apply_updates(_update_set(vc_filter, "enter", "vc_new", "new"))
+
+    assert mirror.find("key", "dc", MagicMock()) == "vc_dc"
+    assert mirror.find("key", "new", MagicMock()) == "vc_new"
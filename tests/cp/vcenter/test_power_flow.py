@@ -0,0 +1,99 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pyVmomi import vim
+
+from cloudshell.cp.vcenter.exceptions import TaskFaultException
+from cloudshell.cp.vcenter.flows.power_flow import VCenterBatchPowerFlow
+from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
+from cloudshell.cp.vcenter.utils.task_waiter import TaskResult
+
+
+def _vm(name: str, power_state: str) -> VmHandler:
+    properties = {"name": name, "summary.runtime.powerState": power_state}
+    return VmHandler(vim.VirtualMachine(name), MagicMock(), properties)
+
+
+@pytest.fixture()
+def si():
+    with patch("cloudshell.cp.vcenter.flows.power_flow.SiHandler") as si_handler:
+        yield si_handler.from_config.return_value
+
+
+@pytest.fixture()
+def dc():
+    with patch("cloudshell.cp.vcenter.flows.power_flow.DcHandler") as dc_handler:
+        yield dc_handler.get_dc.return_value
+
+
+@pytest.fixture()
+def task_waiter():
+    path = "cloudshell.cp.vcenter.flows.power_flow.VcenterTaskWaiter"
+    with patch(path) as task_waiter_class:
+        task_waiter = task_waiter_class.return_value
+        task_waiter.wait_for_tasks.side_effect = lambda tasks, **_: [
+            TaskResult(task) for task in tasks
+        ]
+        yield task_waiter
+
+
+@pytest.fixture()
+def vms(dc):
+    vms = {
+        "uuid-1": _vm("vm-1", "poweredOff"),
+        "uuid-2": _vm("vm-2", "poweredOff"),
+        "uuid-3": _vm("vm-3", "poweredOn"),
+    }
+    dc.get_vms_by_uuids.return_value = vms
+    with patch.object(VmHandler, "add_customization_spec_task"), patch.object(
+        VmHandler, "power_on_task"
+    ):
+        yield vms
+
+
+def _flow(vms) -> VCenterBatchPowerFlow:
+    apps = [MagicMock(vmdetails=MagicMock(uid=uuid)) for uuid in vms]
+    return VCenterBatchPowerFlow(apps, MagicMock(), MagicMock())
+
+
+def test_power_on_customizes_vms(si, dc, task_waiter, vms):
+    spec = MagicMock()
+    si.get_customization_spec.side_effect = (
+        lambda name: spec if name == "vm-1" else None
+    )
+
+    _flow(vms).power_on()
+
+    VmHandler.add_customization_spec_task.assert_called_once_with(spec)
+    assert VmHandler.power_on_task.call_count == 2
+    [customized_vms, _, _] = dc.wait_for_customization_ready.call_args.args
+    assert customized_vms == [vms["uuid-1"]]
+    si.delete_customization_spec.assert_called_once_with("vm-1")
+
+
+def test_power_on_deletes_specs_if_customization_fails(si, dc, task_waiter, vms):
+    si.get_customization_spec.return_value = MagicMock()
+    dc.wait_for_customization_ready.side_effect = Exception("Customization failed")
+
+    with pytest.raises(Exception, match="Customization failed"):
+        _flow(vms).power_on()
+
+    assert [c.args for c in si.delete_customization_spec.call_args_list] == [
+        ("vm-1",),
+        ("vm-2",),
+    ]
+
+
+def test_power_on_keeps_specs_that_were_not_applied(si, dc, task_waiter, vms):
+    si.get_customization_spec.return_value = MagicMock()
+    error = TaskFaultException("Failed")
+    task_waiter.wait_for_tasks.side_effect = lambda tasks, **_: [
+        TaskResult(tasks[0]),
+        TaskResult(tasks[1], error=error),
+    ]
+
+    with pytest.raises(TaskFaultException):
+        _flow(vms).power_on()
+
+    VmHandler.power_on_task.assert_not_called()
+    si.delete_customization_spec.assert_called_once_with("vm-1")
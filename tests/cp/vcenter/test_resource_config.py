@@ -1,4 +1,9 @@
+from unittest.mock import MagicMock
+
+import pytest
+
 from cloudshell.cp.vcenter.constants import SHELL_NAME
+from cloudshell.cp.vcenter.exceptions import InvalidAttributeException
 from cloudshell.cp.vcenter.resource_config import ShutdownMethod, VCenterResourceConfig
 
 
@@ -22,6 +27,8 @@ def test_resource_config(resource_command_context, cs_api):
     execution_server_selector = "Execution Server Selector"
     promiscuous_mode = "true"
     expected_promiscuous_mode = True
+    max_parallel_clones = "3"
+    expected_max_parallel_clones = 3
 
     a_name = VCenterResourceConfig.ATTR_NAMES
     get_full_a_name = lambda n: f"{SHELL_NAME}.{n}"  # noqa: E731
@@ -45,6 +52,7 @@ def test_resource_config(resource_command_context, cs_api):
                 a_name.execution_server_selector
             ): execution_server_selector,
             get_full_a_name(a_name.promiscuous_mode): promiscuous_mode,
+            get_full_a_name(a_name.max_parallel_clones): max_parallel_clones,
         }
     )
     conf = VCenterResourceConfig.from_context(
@@ -70,3 +78,24 @@ def test_resource_config(resource_command_context, cs_api):
     assert conf.reserved_networks == expected_reserved_networks
     assert conf.execution_server_selector == execution_server_selector
     assert conf.promiscuous_mode == expected_promiscuous_mode
+    assert conf.max_parallel_clones == expected_max_parallel_clones
+
+
+def _config_with_max_parallel_clones(value):
+    a_name = VCenterResourceConfig.ATTR_NAMES.max_parallel_clones
+    attributes = {f"{SHELL_NAME}.{a_name}": value}
+    return MagicMock(shell_name=SHELL_NAME, attributes=attributes)
+
+
+def test_empty_max_parallel_clones_is_default():
+    conf = _config_with_max_parallel_clones("")
+
+    assert VCenterResourceConfig.max_parallel_clones.__get__(conf, None) == 5
+
+
+@pytest.mark.parametrize("value", ("0", "-1", "many"))
+def test_invalid_max_parallel_clones(value):
+    conf = _config_with_max_parallel_clones(value)
+
+    with pytest.raises(InvalidAttributeException, match="Max Parallel Clones"):
+        VCenterResourceConfig.max_parallel_clones.__get__(conf, None)
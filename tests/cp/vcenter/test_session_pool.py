@@ -0,0 +1,104 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pyVmomi import vim
+
+from cloudshell.cp.vcenter.utils.session_pool import SessionPool
+
+
+class SiUser:
+    pass
+
+
+@pytest.fixture()
+def get_si():
+    with patch("cloudshell.cp.vcenter.utils.session_pool.get_si") as get_si_mock:
+        get_si_mock.side_effect = lambda *args, **kwargs: MagicMock()
+        yield get_si_mock
+
+
+@pytest.fixture()
+def disconnect():
+    with patch("cloudshell.cp.vcenter.utils.session_pool.Disconnect") as m:
+        yield m
+
+
+@pytest.fixture()
+def logger():
+    return MagicMock()
+
+
+def test_session_reused(get_si, logger):
+    pool = SessionPool()
+
+    si1 = pool.get_si("host", "user", "password", logger)
+    si2 = pool.get_si("host", "user", "password", logger)
+
+    assert si1 is si2
+    get_si.assert_called_once_with("host", "user", "password", 443, logger)
+    assert pool.misses == 1
+    assert pool.hits == 1
+
+
+def test_different_credentials_get_different_sessions(get_si, logger):
+    pool = SessionPool()
+
+    si1 = pool.get_si("host", "user", "password", logger)
+    si2 = pool.get_si("host", "user", "new password", logger)
+
+    assert si1 is not si2
+    assert pool.misses == 2
+
+
+def test_relogin_when_session_is_not_authenticated(get_si, logger):
+    pool = SessionPool()
+    si1 = pool.get_si("host", "user", "password", logger)
+    type(si1.content.sessionManager).currentSession = property(
+        MagicMock(side_effect=vim.fault.NotAuthenticated)
+    )
+
+    si2 = pool.get_si("host", "user", "password", logger)
+
+    assert si1 is not si2
+    assert pool.relogins == 1
+
+
+def test_idle_session_evicted(get_si, disconnect, logger):
+    pool = SessionPool(idle_timeout=-1)
+    si = pool.get_si("host", "user", "password", logger)
+
+    pool.evict_idle(logger)
+
+    disconnect.assert_called_once_with(si)
+    assert pool.evictions == 1
+    assert pool.stats["sessions"] == 0
+
+
+def test_tracked_session_is_not_evicted(get_si, disconnect, logger):
+    pool = SessionPool(idle_timeout=-1)
+    si = pool.get_si("host", "user", "password", logger)
+    user = SiUser()
+    pool.track(si, user)
+
+    pool.evict_idle(logger)
+    disconnect.assert_not_called()
+
+    del user
+    pool.evict_idle(logger)
+    disconnect.assert_called_once_with(si)
+
+
+def test_watcher_of_expired_session_stopped(get_si, logger):
+    pool = SessionPool()
+    si1 = pool.get_si("host", "user", "password", logger)
+    watcher = pool.get_customization_watcher(si1)
+    type(si1.content.sessionManager).currentSession = property(
+        MagicMock(side_effect=vim.fault.NotAuthenticated)
+    )
+
+    si2 = pool.get_si("host", "user", "password", logger)
+
+    future = watcher.watch(MagicMock(), MagicMock(), logger)
+    with pytest.raises(RuntimeError, match="stopped"):
+        future.result(0)
+    assert pool.get_customization_watcher(si2) is not watcher
@@ -0,0 +1,92 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from cloudshell.cp.vcenter.exceptions import VSphereAPIAlreadyExistsException
+from cloudshell.cp.vcenter.handlers.vsphere_sdk_handler import VSphereSDKHandler
+from cloudshell.cp.vcenter.utils.tags_cache import TagIdsCache, tags_cache
+
+
+@pytest.fixture()
+def vsphere_client():
+    client = MagicMock(address="vcenter", username="user")
+    client.create_category.side_effect = VSphereAPIAlreadyExistsException()
+    client.get_category_list.return_value = ["cat-1", "cat-2"]
+    client.get_category_info.side_effect = lambda category_id: {
+        "id": category_id,
+        "name": f"name-{category_id}",
+    }
+    client.create_tag.side_effect = lambda name, category_id: f"tag-{name}"
+    yield client
+    tags_cache.invalidate("vcenter")
+
+
+def test_tag_ids_cached(vsphere_client):
+    handler = VSphereSDKHandler(vsphere_client, MagicMock(), MagicMock())
+    tags = {"name-cat-1": "a", "name-cat-2": "b"}
+
+    handler.assign_tags(MagicMock(), tags)
+    handler.assign_tags(MagicMock(), tags)
+
+    vsphere_client.create_category.assert_called_once()
+    vsphere_client.get_category_list.assert_called_once()
+    assert vsphere_client.create_tag.call_count == 2
+    assert vsphere_client.attach_multiple_tags_to_object.call_count == 2
+    _, kwargs = vsphere_client.attach_multiple_tags_to_object.call_args
+    assert kwargs["tag_ids"] == ["tag-a", "tag-b"]
+
+
+def test_expired_ids_dropped():
+    cache = TagIdsCache(ttl=-1)
+    cache.add(("vcenter", "user"), "name", "id")
+
+    assert cache.get(("vcenter", "user"), "name") is None
+
+
+def test_tags_attached_to_many_objects_per_tag(vsphere_client):
+    handler = VSphereSDKHandler(vsphere_client, MagicMock(), MagicMock())
+    objs = [MagicMock(_moId=f"vm-{i}", _wsdl_name="VirtualMachine") for i in range(3)]
+
+    handler.assign_tags_to_objects(objs, {"name-cat-1": "a", "name-cat-2": "b"})
+
+    attach = vsphere_client.attach_tag_to_multiple_objects
+    assert attach.call_count == 2
+    objects = [(f"vm-{i}", "VirtualMachine") for i in range(3)]
+    attach.assert_any_call("tag-a", objects)
+    attach.assert_any_call("tag-b", objects)
+
+
+def test_reservation_tags_deleted_with_batch_calls(vsphere_client):
+    tags_manager = MagicMock()
+    tags_manager.get_default_tags.return_value = {"SandboxId": "reservation"}
+    tags_cache.add(("vcenter", "user"), "SandboxId", "cat-sandbox")
+    tags_cache.add(("vcenter", "user", "cat-sandbox"), "reservation", "tag-sandbox")
+    vm = {"id": "vm-1", "type": "VirtualMachine"}
+    folder = {"id": "group-1", "type": "Folder"}
+    other_vm = {"id": "vm-2", "type": "VirtualMachine"}
+    vsphere_client.list_attached_objects.return_value = [vm, folder]
+    vsphere_client.list_attached_tags_on_objects.return_value = [
+        {"object_id": vm, "tag_ids": ["tag-sandbox", "tag-bp", "tag-owner"]},
+        {"object_id": folder, "tag_ids": ["tag-sandbox", "tag-bp"]},
+    ]
+    vsphere_client.list_attached_objects_on_tags.return_value = [
+        {"tag_id": "tag-bp", "object_ids": [vm, folder]},
+        {"tag_id": "tag-owner", "object_ids": [vm, other_vm]},
+    ]
+    handler = VSphereSDKHandler(vsphere_client, tags_manager, MagicMock())
+
+    handler.delete_reservation_tags()
+
+    vsphere_client.list_attached_objects.assert_called_once_with(tag_id="tag-sandbox")
+    deleted = {call.args[0] for call in vsphere_client.delete_tag.call_args_list}
+    assert deleted == {"tag-bp", "tag-sandbox"}
+
+
+def test_tag_ids_cached_per_user(vsphere_client):
+    tags_cache.add(("vcenter", "admin"), "name-cat-1", "cat-admin")
+    handler = VSphereSDKHandler(vsphere_client, MagicMock(), MagicMock())
+
+    handler.assign_tags(MagicMock(), {"name-cat-1": "a"})
+
+    vsphere_client.create_category.assert_called_once()
+    vsphere_client.create_tag.assert_called_once_with(name="a", category_id="cat-1")
@@ -0,0 +1,36 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from cloudshell.cp.vcenter.actions.vm_network import VMNetworkActions
+from cloudshell.cp.vcenter.exceptions import VMIPNotFoundException
+
+
+def _nic_info(network, *ips):
+    return MagicMock(network=network, ipAddress=list(ips))
+
+
+def test_ip_checked_on_guest_updates():
+    vm = MagicMock(guest_ip_address=None, guest_net=[])
+
+    def iter_updates(paths, max_wait_seconds):
+        yield True
+        yield False
+        vm.guest_net = [_nic_info("net", "fe80::1", "192.168.1.10")]
+        yield True
+
+    vm.iter_properties_updates.side_effect = iter_updates
+    actions = VMNetworkActions(MagicMock(), MagicMock(), MagicMock())
+
+    assert actions.get_vm_ip(vm, ip_regex=r"192\.168\..*", timeout=60) == (
+        "192.168.1.10"
+    )
+
+
+def test_ip_not_found_after_timeout():
+    vm = MagicMock(guest_ip_address="10.0.0.1", guest_net=[])
+    vm.iter_properties_updates.return_value = (c for c in [True, False, False])
+    actions = VMNetworkActions(MagicMock(), MagicMock(), MagicMock())
+
+    with pytest.raises(VMIPNotFoundException):
+        actions.get_vm_ip(vm, ip_regex=r"192\.168\..*")
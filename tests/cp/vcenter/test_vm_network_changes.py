@@ -0,0 +1,39 @@
+from unittest.mock import MagicMock
+
+from pyVmomi import vim
+
+from cloudshell.cp.vcenter.handlers.vm_handler import VmNetworkChanges
+from cloudshell.cp.vcenter.handlers.vnic_handler import VnicHandler
+
+
+def _vnic(key: int, mac: str) -> VnicHandler:
+    return VnicHandler(vim.vm.device.VirtualVmxnet3(key=key, macAddress=mac))
+
+
+def test_changes_applied_with_one_task():
+    vm = MagicMock(_properties=None)
+    old_vnic = _vnic(4000, "00:00:00:00:00:01")
+    vm.vnics = [old_vnic]
+    port_group = MagicMock(key="pg-key", switch_uuid="dvs-uuid")
+    changes = VmNetworkChanges(vm)
+
+    changes.connect_vnic_to_port_group(old_vnic, port_group)
+    changes.connect_vnic_to_port_group(VnicHandler.create_new(), port_group)
+    changes.connect_vnic_to_port_group(VnicHandler.create_new(), port_group)
+
+    new_vnics = [_vnic(4002, "00:00:00:00:00:03"), _vnic(4001, "00:00:00:00:00:02")]
+    task_waiter = MagicMock()
+    task_waiter.wait_for_task.side_effect = lambda task: setattr(
+        vm, "vnics", [old_vnic, *new_vnics]
+    )
+    vnics = changes.apply(MagicMock(), task_waiter)
+
+    vm._entity.ReconfigVM_Task.assert_called_once()
+    [config_spec] = vm._entity.ReconfigVM_Task.call_args.args
+    assert [spec.device.key for spec in config_spec.deviceChange] == [4000, -1, -2]
+    task_waiter.wait_for_task.assert_called_once()
+    assert [vnic.mac_address for vnic in vnics] == [
+        "00:00:00:00:00:01",
+        "00:00:00:00:00:02",
+        "00:00:00:00:00:03",
+    ]
@@ -0,0 +1,70 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from cloudshell.cp.vcenter.handlers.vsphere_api_handler import (
+    AsyncVSphereAutomationAPI,
+    VSphereAutomationAPI,
+)
+from cloudshell.cp.vcenter.utils.async_runner import AsyncRunner
+
+
+def _response(status_code, value=None):
+    res = MagicMock(status_code=status_code)
+    res.json.return_value = {"value": value}
+    return res
+
+
+def _client(session):
+    return VSphereAutomationAPI("vcenter", "user", "password", session=session)
+
+
+def test_session_id_reused():
+    session = MagicMock(headers={})
+    session.request.return_value = _response(200, "session-id")
+
+    _client(session).connect()
+    _client(session).connect()
+
+    session.request.assert_called_once()
+    assert session.headers["vmware-api-session-id"] == "session-id"
+
+
+def test_login_again_on_expired_session():
+    session = MagicMock(headers={"vmware-api-session-id": "expired"})
+    session.request.side_effect = [
+        _response(401),
+        _response(200, "new-session-id"),
+        _response(200, ["category-id"]),
+    ]
+
+    assert _client(session).get_category_list() == ["category-id"]
+
+    assert session.headers["vmware-api-session-id"] == "new-session-id"
+    login_call = session.request.call_args_list[1]
+    assert login_call.args[0] == "POST"
+    assert login_call.kwargs["url"].endswith("/session")
+
+
+def test_async_client_gathers_calls():
+    client = MagicMock()
+    client.get_tag_info.side_effect = lambda tag_id: {"id": tag_id}
+    runner = AsyncRunner(max_workers=2)
+
+    async def gather():
+        async_client = AsyncVSphereAutomationAPI(client, runner.executor)
+        return await asyncio.gather(
+            *(async_client.get_tag_info(f"tag-{i}") for i in range(5))
+        )
+
+    try:
+        assert runner.run(gather()) == [{"id": f"tag-{i}"} for i in range(5)]
+        # the same loop is reused, also from the code inside of another loop
+        loop = runner._loop
+
+        async def caller():
+            return runner.run(gather())
+
+        assert asyncio.run(caller()) == [{"id": f"tag-{i}"} for i in range(5)]
+        assert runner._loop is loop
+    finally:
+        runner.close()